@@ -45,7 +45,7 @@ try {
 
 	# Check python
 	$python = Get-Command python -ErrorAction SilentlyContinue
-	if(-not $python){ Err "Python not found in PATH. Install Python 3.8+ and retry."; exit 2 }
+	if(-not $python){ Err "Python not found in PATH. Install Python 3.10+ and retry."; exit 2 }
 
 	# Create venv
 	if(-not (Test-Path $VenvDir)){
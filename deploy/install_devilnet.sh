@@ -32,7 +32,7 @@ info "Starting Devilnet installer..."
 
 # 1) Check python
 if ! command -v "$PYTHON_BIN" >/dev/null 2>&1; then
-  err "$PYTHON_BIN not found. Please install Python 3.8+ and retry."
+  err "$PYTHON_BIN not found. Please install Python 3.10+ and retry."
   exit 2
 fi
 
@@ -5,7 +5,8 @@ Maps detected anomalies to MITRE ATT&CK techniques for standardized threat class
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Set, Optional
+from types import MappingProxyType
+from typing import List, Dict, Set, Optional, Tuple
 from enum import Enum
 
 
@@ -38,7 +39,7 @@ class MitreATTACKTechnique:
 class MitreATTACKMapping:
     """Maps security events to MITRE ATT&CK framework"""
     
-    TECHNIQUES = {
+    TECHNIQUES = MappingProxyType({
         # Credential Access
         'T1110': MitreATTACKTechnique(
             technique_id='T1110',
@@ -232,55 +233,80 @@ class MitreATTACKMapping:
                 'Grep for credentials in files',
             ]
         ),
-    }
+    })
     
-    @staticmethod
-    def get_techniques_for_event(event_type: str, anomaly_features: Dict) -> List[MitreATTACKTechnique]:
-        """Map an event to applicable MITRE techniques"""
-        techniques = []
-        
+    # Mapping rules in evaluation order: (event type filter, feature predicate,
+    # techniques). A None filter applies to every event type.
+    _RULES = (
         # Brute force detection
-        if event_type == 'login_failed' and anomaly_features.get('ip_failed_logins', 0) > 5:
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1110'])
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1110.001'])
+        (lambda et: et == 'login_failed',
+         lambda f: f.get('ip_failed_logins', 0) > 5,
+         (TECHNIQUES['T1110'], TECHNIQUES['T1110.001'])),
         
         # Invalid user enumeration
-        if event_type == 'invalid_user_attempt':
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1110'])
+        (lambda et: et == 'invalid_user_attempt',
+         lambda f: True,
+         (TECHNIQUES['T1110'],)),
         
         # Successful login after failures (credential stuffing)
-        if event_type == 'login_success' and anomaly_features.get('ip_failed_to_success_ratio', 0) > 0.5:
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1110.004'])
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1078'])
+        (lambda et: et == 'login_success',
+         lambda f: f.get('ip_failed_to_success_ratio', 0) > 0.5,
+         (TECHNIQUES['T1110.004'], TECHNIQUES['T1078'])),
         
         # Valid account abuse - new IP or unusual time
-        if event_type == 'login_success' and anomaly_features.get('user_new_ip_detected', False):
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1078'])
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1078.001'])
+        (lambda et: et == 'login_success',
+         lambda f: f.get('user_new_ip_detected', False),
+         (TECHNIQUES['T1078'], TECHNIQUES['T1078.001'])),
         
         # Privilege escalation via sudo
-        if 'sudo' in event_type:
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1548'])
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1548.003'])
+        (lambda et: 'sudo' in et,
+         lambda f: True,
+         (TECHNIQUES['T1548'], TECHNIQUES['T1548.003'])),
         
         # First sudo usage
-        if event_type == 'sudo_success' and anomaly_features.get('user_first_sudo_usage', False):
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1548'])
+        (lambda et: et == 'sudo_success',
+         lambda f: f.get('user_first_sudo_usage', False),
+         (TECHNIQUES['T1548'],)),
         
         # Failed sudo
-        if event_type == 'sudo_failure' and anomaly_features.get('user_failed_sudo_attempts', 0) > 3:
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1548.003'])
+        (lambda et: et == 'sudo_failure',
+         lambda f: f.get('user_failed_sudo_attempts', 0) > 3,
+         (TECHNIQUES['T1548.003'],)),
         
         # Rapid privesc (login to sudo)
-        if anomaly_features.get('session_login_to_privesc_seconds', 0) > 0 and \
-           anomaly_features.get('session_login_to_privesc_seconds', 0) < 60:
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1548'])
+        (None,
+         lambda f: 0 < f.get('session_login_to_privesc_seconds', 0) < 60,
+         (TECHNIQUES['T1548'],)),
         
         # LOLBin execution
-        if anomaly_features.get('session_lolbin_executed', False):
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1059.004'])
-            techniques.append(MitreATTACKMapping.TECHNIQUES['T1105'])
-        
+        (None,
+         lambda f: f.get('session_lolbin_executed', False),
+         (TECHNIQUES['T1059.004'], TECHNIQUES['T1105'])),
+    )
+    
+    # event_type -> rules whose event filter accepts it, filled on first use
+    _EVENT_INDEX: Dict[str, Tuple] = {}
+    
+    @staticmethod
+    def _rules_for_event(event_type: str) -> Tuple:
+        """Rules applicable to an event type, in evaluation order"""
+        rules = MitreATTACKMapping._EVENT_INDEX.get(event_type)
+        if rules is None:
+            rules = tuple(
+                (predicate, techniques)
+                for event_filter, predicate, techniques in MitreATTACKMapping._RULES
+                if event_filter is None or event_filter(event_type)
+            )
+            MitreATTACKMapping._EVENT_INDEX[event_type] = rules
+        return rules
+    
+    @staticmethod
+    def get_techniques_for_event(event_type: str, anomaly_features: Dict) -> List[MitreATTACKTechnique]:
+        """Map an event to applicable MITRE techniques"""
+        techniques = []
+        for predicate, matched in MitreATTACKMapping._rules_for_event(event_type):
+            if predicate(anomaly_features):
+                techniques.extend(matched)
         return techniques
     
     @staticmethod
@@ -7,16 +7,23 @@ Handles auth.log, syslog, auditd, and fail2ban logs.
 
 import re
 import json
+import bisect
+import itertools
 from datetime import datetime
 from typing import Dict, List, Optional, Generator
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthEvent:
     """Structured authentication event"""
     timestamp: str
@@ -73,6 +80,21 @@ class LogParser:
         ),
     }
     
+    # Order in which auth.log patterns are tried. SSH disconnects carry no
+    # authentication outcome, so such lines fall through to later patterns.
+    _AUTH_PATTERN_ORDER = (
+        ('ssh_failed', SSH_PATTERNS['failed']),
+        ('ssh_success', SSH_PATTERNS['success']),
+        ('ssh_invalid_user', SSH_PATTERNS['invalid_user']),
+        ('sudo_success', SUDO_PATTERNS['success']),
+        ('sudo_failure', SUDO_PATTERNS['failure']),
+    )
+    
+    # Hyperscan database for _AUTH_PATTERN_ORDER, compiled on first batch;
+    # set _auth_hs_failed once hyperscan rejects it so batches use re only
+    _auth_hs_db = None
+    _auth_hs_failed = False
+    
     @staticmethod
     def parse_auth_log_line(line: str) -> Optional[AuthEvent]:
         """Parse a single line from /var/log/auth.log"""
@@ -80,93 +102,161 @@ class LogParser:
             return None
         
         try:
-            # Try SSH patterns first
-            for event_type, pattern in LogParser.SSH_PATTERNS.items():
+            for kind, pattern in LogParser._AUTH_PATTERN_ORDER:
                 match = pattern.search(line)
                 if match:
-                    groups = match.groups()
-                    timestamp = groups[0]
-                    
-                    if event_type == 'failed':
-                        return AuthEvent(
-                            timestamp=timestamp,
-                            host='localhost',
-                            source_ip=groups[2],
-                            source_port=int(groups[3]),
-                            username=groups[1],
-                            auth_method='password',
-                            event_type='login_failed',
-                            service='sshd',
-                            message=line,
-                            raw_line=line,
-                        )
-                    
-                    elif event_type == 'success':
-                        return AuthEvent(
-                            timestamp=timestamp,
-                            host='localhost',
-                            source_ip=groups[3],
-                            source_port=int(groups[4]),
-                            username=groups[2],
-                            auth_method=groups[1],
-                            event_type='login_success',
-                            service='sshd',
-                            message=line,
-                            raw_line=line,
-                        )
-                    
-                    elif event_type == 'invalid_user':
-                        return AuthEvent(
-                            timestamp=timestamp,
-                            host='localhost',
-                            source_ip=groups[2],
-                            source_port=int(groups[3]),
-                            username=groups[1],
-                            auth_method='password',
-                            event_type='invalid_user_attempt',
-                            service='sshd',
-                            message=line,
-                            raw_line=line,
-                        )
-            
-            # Try sudo patterns
-            for event_type, pattern in LogParser.SUDO_PATTERNS.items():
-                match = pattern.search(line)
-                if match:
-                    groups = match.groups()
-                    timestamp = groups[0]
-                    username = groups[1]
-                    
-                    return AuthEvent(
-                        timestamp=timestamp,
-                        host='localhost',
-                        source_ip=None,
-                        source_port=None,
-                        username=username,
-                        auth_method='sudo',
-                        event_type=f'sudo_{event_type}',
-                        service='sudo',
-                        message=line,
-                        raw_line=line,
-                    )
+                    return LogParser._auth_event_from_match(kind, match.groups(), line)
             
             # If no patterns matched, return generic event
+            return LogParser._unparsed_auth_event(line, datetime.now().isoformat())
+        
+        except Exception as e:
+            logger.debug(f"Failed to parse line: {line}: {e}")
+            return None
+    
+    @staticmethod
+    def parse_auth_log_batch(lines: List[str]) -> List[Optional[AuthEvent]]:
+        """
+        Parse a batch of auth.log lines.
+        
+        Returns the same events as parse_auth_log_line on each line. With
+        hyperscan installed, one scan over the whole batch finds which
+        patterns can match each line, so only those regexes run per line.
+        """
+        now = datetime.now().isoformat()
+        candidates = LogParser._auth_pattern_candidates(lines)
+        order = LogParser._AUTH_PATTERN_ORDER
+        events = []
+        
+        for i, line in enumerate(lines):
+            if not line.strip():
+                events.append(None)
+                continue
+            
+            patterns = order if candidates is None else [order[k] for k in sorted(candidates[i])]
+            try:
+                for kind, pattern in patterns:
+                    match = pattern.search(line)
+                    if match:
+                        events.append(LogParser._auth_event_from_match(kind, match.groups(), line))
+                        break
+                else:
+                    events.append(LogParser._unparsed_auth_event(line, now))
+            except Exception as e:
+                logger.debug(f"Failed to parse line: {line}: {e}")
+                events.append(None)
+        
+        return events
+    
+    @staticmethod
+    def _auth_pattern_candidates(lines: List[str]) -> Optional[List[set]]:
+        """Indices into _AUTH_PATTERN_ORDER that hyperscan matched on each line"""
+        if hyperscan is None or LogParser._auth_hs_failed or not lines:
+            return None
+        
+        encoded = [line.encode('utf-8', 'replace') for line in lines]
+        # Exclusive end offset of each line in the newline-joined buffer
+        line_ends = list(itertools.accumulate(len(data) + 1 for data in encoded))
+        candidates = [set() for _ in lines]
+        
+        def on_match(pattern_id, start, end, flags, context):
+            candidates[bisect.bisect_left(line_ends, end)].add(pattern_id)
+        
+        try:
+            if LogParser._auth_hs_db is None:
+                expressions = [pattern.pattern.encode() for _, pattern in LogParser._AUTH_PATTERN_ORDER]
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=expressions,
+                    ids=list(range(len(expressions))),
+                    elements=len(expressions),
+                    flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(expressions),
+                )
+                LogParser._auth_hs_db = db
+            LogParser._auth_hs_db.scan(b'\n'.join(encoded), match_event_handler=on_match)
+        except hyperscan.error as e:
+            # e.g. a pattern hyperscan can't compile; fall back to re for good
+            LogParser._auth_hs_failed = True
+            logger.warning("Hyperscan prefilter disabled, parsing with re: %s", e)
+            return None
+        return candidates
+    
+    @staticmethod
+    def _auth_event_from_match(kind: str, groups: tuple, line: str) -> AuthEvent:
+        """Build an AuthEvent from the groups of an _AUTH_PATTERN_ORDER match"""
+        timestamp = groups[0]
+        
+        if kind == 'ssh_failed':
             return AuthEvent(
-                timestamp=datetime.now().isoformat(),
+                timestamp=timestamp,
                 host='localhost',
-                source_ip=None,
-                source_port=None,
-                username=None,
-                auth_method='unknown',
-                event_type='unknown',
-                service='unknown',
+                source_ip=groups[2],
+                source_port=int(groups[3]),
+                username=groups[1],
+                auth_method='password',
+                event_type='login_failed',
+                service='sshd',
                 message=line,
                 raw_line=line,
             )
         
-        except Exception as e:
-            logger.debug(f"Failed to parse line: {line}: {e}")
-            return None
+        elif kind == 'ssh_success':
+            return AuthEvent(
+                timestamp=timestamp,
+                host='localhost',
+                source_ip=groups[3],
+                source_port=int(groups[4]),
+                username=groups[2],
+                auth_method=groups[1],
+                event_type='login_success',
+                service='sshd',
+                message=line,
+                raw_line=line,
+            )
+        
+        elif kind == 'ssh_invalid_user':
+            return AuthEvent(
+                timestamp=timestamp,
+                host='localhost',
+                source_ip=groups[2],
+                source_port=int(groups[3]),
+                username=groups[1],
+                auth_method='password',
+                event_type='invalid_user_attempt',
+                service='sshd',
+                message=line,
+                raw_line=line,
+            )
+        
+        # sudo_success / sudo_failure
+        return AuthEvent(
+            timestamp=timestamp,
+            host='localhost',
+            source_ip=None,
+            source_port=None,
+            username=groups[1],
+            auth_method='sudo',
+            event_type=kind,
+            service='sudo',
+            message=line,
+            raw_line=line,
+        )
+    
+    @staticmethod
+    def _unparsed_auth_event(line: str, timestamp: str) -> AuthEvent:
+        """Generic event for an auth.log line no pattern recognised"""
+        return AuthEvent(
+            timestamp=timestamp,
+            host='localhost',
+            source_ip=None,
+            source_port=None,
+            username=None,
+            auth_method='unknown',
+            event_type='unknown',
+            service='unknown',
+            message=line,
+            raw_line=line,
+        )
     
     @staticmethod
     def parse_syslog_line(line: str) -> Optional[AuthEvent]:
@@ -281,10 +371,11 @@ class LogIngestionPipeline:
         
         # Auth log
         if 'auth_log' in self.tailers:
-            for line in self.tailers['auth_log'].tail(batch_size):
-                event = self.parser.parse_auth_log_line(line)
-                if event:
-                    events.append(event)
+            lines = list(self.tailers['auth_log'].tail(batch_size))
+            events.extend(
+                event for event in self.parser.parse_auth_log_batch(lines)
+                if event
+            )
         
         # Syslog
         if 'syslog' in self.tailers:
@@ -0,0 +1,81 @@
+"""
+Feature Extraction Kernels
+
+Tight per-row loops used by batch feature extraction. When numba is
+installed they are JIT-compiled over numpy arrays; otherwise the same code
+runs as plain Python over lists.
+"""
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+
+def _running_ip_counts(ip_ids, stores, failed, pair_ids, ip_failed, ip_users, pair_seen,
+                       failed_out, users_out):
+    """Accumulate per-IP counters row by row, writing each row's totals"""
+    for i in range(len(ip_ids)):
+        ip = ip_ids[i]
+        if stores[i]:
+            if failed[i]:
+                ip_failed[ip] += 1
+            pair = pair_ids[i]
+            if pair >= 0 and not pair_seen[pair]:
+                pair_seen[pair] = True
+                ip_users[ip] += 1
+        failed_out[i] = ip_failed[ip]
+        users_out[i] = ip_users[ip]
+
+
+_running_ip_counts_jit = njit(cache=True)(_running_ip_counts) if njit is not None else None
+
+
+def running_ip_counts(
+    ip_ids: Sequence[int],
+    stores: Sequence[bool],
+    failed: Sequence[bool],
+    pair_ids: Sequence[int],
+    ip_failed: Sequence[int],
+    ip_users: Sequence[int],
+    pair_seen: Sequence[bool],
+) -> Tuple[List[int], List[int]]:
+    """
+    Running failed-login and unique-user counts per IP over a batch.
+
+    Rows are identified by factorized IP id; a row only adds to its IP's
+    counters when `stores` is set (the event lands in the window), and only
+    the first row for each (IP, username) pair id bumps the user count.
+    `ip_failed`, `ip_users` and `pair_seen` seed the counters with history
+    already in the window. Returns the totals as seen after each row.
+    """
+    n = len(ip_ids)
+
+    if _running_ip_counts_jit is None:
+        failed_out = [0] * n
+        users_out = [0] * n
+        _running_ip_counts(
+            ip_ids, stores, failed, pair_ids,
+            list(ip_failed), list(ip_users), list(pair_seen),
+            failed_out, users_out,
+        )
+        return failed_out, users_out
+
+    failed_out = np.empty(n, dtype=np.int64)
+    users_out = np.empty(n, dtype=np.int64)
+    _running_ip_counts_jit(
+        np.asarray(ip_ids, dtype=np.int64),
+        np.asarray(stores, dtype=np.bool_),
+        np.asarray(failed, dtype=np.bool_),
+        np.asarray(pair_ids, dtype=np.int64),
+        np.array(ip_failed, dtype=np.int64),
+        np.array(ip_users, dtype=np.int64),
+        np.array(pair_seen, dtype=np.bool_),
+        failed_out,
+        users_out,
+    )
+    return failed_out.tolist(), users_out.tolist()
@@ -7,11 +7,14 @@ Computes sliding-window aggregations per IP, user, and session.
 
 import statistics
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
 
+from devilnet.ingestion.log_parser import AuthEvent
+from devilnet.ml._feature_kernels import running_ip_counts
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,6 +83,10 @@ class FeatureExtractor:
         'git', 'svn',
     }
     
+    # Fields kept per history entry, in snapshot column order
+    IP_EVENT_FIELDS = ('timestamp', 'username', 'event_type', 'auth_method')
+    USER_EVENT_FIELDS = ('timestamp', 'source_ip', 'event_type')
+    
     def __init__(self, window_minutes: int = 5):
         self.window_minutes = window_minutes
         
@@ -98,14 +105,139 @@ class FeatureExtractor:
         # Session tracking
         self.user_sessions: Dict[Tuple[str, str], Dict] = defaultdict(dict)
     
+    def dump_state(self) -> Dict:
+        """
+        Snapshot the extractor's history as plain columns.
+        
+        The snapshot shares no mutable containers with the extractor and is
+        picklable, so a warmed-up extractor can be cloned with from_state
+        instead of replaying the events that built it.
+        """
+        def columns(entries, fields):
+            return {f: [e[f] for e in entries] for f in fields}
+        
+        return {
+            'window_minutes': self.window_minutes,
+            'ip_events': {
+                ip: columns(entries, self.IP_EVENT_FIELDS)
+                for ip, entries in self.ip_events.items()
+            },
+            'user_events': {
+                user: columns(entries, self.USER_EVENT_FIELDS)
+                for user, entries in self.user_events.items()
+            },
+            'user_login_times': {user: list(times) for user, times in self.user_login_times.items()},
+            'user_known_ips': {user: sorted(ips) for user, ips in self.user_known_ips.items()},
+            'user_sessions': {key: dict(session) for key, session in self.user_sessions.items()},
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> "FeatureExtractor":
+        """Build an extractor from a dump_state snapshot"""
+        def rows(cols, fields):
+            return [dict(zip(fields, row)) for row in zip(*(cols[f] for f in fields))]
+        
+        extractor = cls(window_minutes=state['window_minutes'])
+        for ip, cols in state['ip_events'].items():
+            extractor.ip_events[ip] = rows(cols, cls.IP_EVENT_FIELDS)
+        for user, cols in state['user_events'].items():
+            extractor.user_events[user] = rows(cols, cls.USER_EVENT_FIELDS)
+        for user, times in state['user_login_times'].items():
+            extractor.user_login_times[user] = list(times)
+        for user, ips in state['user_known_ips'].items():
+            extractor.user_known_ips[user] = set(ips)
+        for key, session in state['user_sessions'].items():
+            extractor.user_sessions[key] = dict(session)
+        return extractor
+    
     def extract_features(self, event) -> FeatureVector:
         """Extract feature vector from an authentication event"""
+        return self._extract(event)
+    
+    def extract_features_batch(self, events) -> List[FeatureVector]:
+        """
+        Extract feature vectors for a sequence of events in one sweep.
+        
+        Equivalent to calling extract_features on each event in order, but
+        the window cutoff is computed once and old events are pruned once
+        per batch instead of rescanning every IP and user after each event.
+        Per-IP failed-login and unique-user counts come from one running
+        pass over the batch rather than a window scan per event.
+        """
+        cutoff = datetime.now() - timedelta(minutes=self.window_minutes)
+        self._cleanup_old_events(cutoff)
+        events = list(events)
+        ip_counts = zip(*self._batch_ip_counts(events, cutoff))
+        extract = self._extract
+        return [extract(event, cutoff, counts) for event, counts in zip(events, ip_counts)]
+    
+    def _batch_ip_counts(self, events: List, cutoff: datetime) -> Tuple[List[int], List[int]]:
+        """Running per-IP failed-login and unique-user counts for a batch"""
+        ip_index: Dict[str, int] = {}
+        pair_index: Dict[Tuple[int, str], int] = {}
+        ip_ids, stores, failed, usernames = [], [], [], []
+        
+        for event in events:
+            ip_ids.append(ip_index.setdefault(event.source_ip or "unknown", len(ip_index)))
+            # Mirrors _update_event_history: only in-window events with an IP are stored
+            in_window = not isinstance(event.timestamp, str) or datetime.fromisoformat(event.timestamp) > cutoff
+            stores.append(bool(event.source_ip) and in_window)
+            failed.append('failed' in event.event_type)
+            usernames.append(event.username)
+        
+        # Seed counters with what the window already holds for these IPs
+        ip_failed = [0] * len(ip_index)
+        ip_users = [0] * len(ip_index)
+        for ip, ip_id in ip_index.items():
+            history = self.ip_events.get(ip, ())
+            ip_failed[ip_id] = sum(1 for e in history if 'failed' in e['event_type'])
+            users = {e['username'] for e in history if e['username']}
+            ip_users[ip_id] = len(users)
+            for user in users:
+                pair_index[(ip_id, user)] = len(pair_index)
+        pair_seen = [True] * len(pair_index)
+        
+        pair_ids = [
+            pair_index.setdefault((ip_id, user), len(pair_index)) if store and user else -1
+            for ip_id, store, user in zip(ip_ids, stores, usernames)
+        ]
+        pair_seen += [False] * (len(pair_index) - len(pair_seen))
+        
+        return running_ip_counts(ip_ids, stores, failed, pair_ids, ip_failed, ip_users, pair_seen)
+    
+    def extract_from_columns(self, columns: Mapping[str, Sequence]) -> List[FeatureVector]:
+        """
+        Extract feature vectors from column-oriented events.
+        
+        Columns map AuthEvent field names to equal-length sequences (lists or
+        numpy arrays); missing fields default to None. Rows are fed through
+        extract_features_batch in column order.
+        """
+        names = [name for name in AuthEvent.__dataclass_fields__ if name in columns]
+        values = [
+            column.tolist() if hasattr(column, 'tolist') else column
+            for column in (columns[name] for name in names)
+        ]
+        missing = dict.fromkeys(
+            name for name in AuthEvent.__dataclass_fields__ if name not in columns
+        )
+        return self.extract_features_batch(
+            AuthEvent(**dict(zip(names, row)), **missing) for row in zip(*values)
+        )
+    
+    def _extract(
+        self,
+        event,
+        cutoff: Optional[datetime] = None,
+        ip_counts: Optional[Tuple[int, int]] = None,
+    ) -> FeatureVector:
+        """Update history with an event and compute its feature vector"""
         timestamp = datetime.fromisoformat(event.timestamp) if isinstance(event.timestamp, str) else event.timestamp
         source_ip = event.source_ip or "unknown"
         username = event.username or "unknown"
         
         # Update event history
-        self._update_event_history(event)
+        self._update_event_history(event, cutoff)
         
         # Extract features
         vector = FeatureVector(
@@ -117,8 +249,11 @@ class FeatureExtractor:
         )
         
         # Per-IP features
-        vector.ip_failed_logins = self._get_ip_failed_logins(source_ip)
-        vector.ip_unique_users_attempted = self._get_ip_unique_users(source_ip)
+        if ip_counts is None:
+            vector.ip_failed_logins = self._get_ip_failed_logins(source_ip)
+            vector.ip_unique_users_attempted = self._get_ip_unique_users(source_ip)
+        else:
+            vector.ip_failed_logins, vector.ip_unique_users_attempted = ip_counts
         vector.ip_failed_to_success_ratio = self._get_ip_failure_ratio(source_ip)
         vector.ip_avg_inter_attempt_seconds = self._get_ip_inter_attempt_time(source_ip)
         vector.ip_auth_method_variance = self._get_ip_auth_method_variance(source_ip)
@@ -135,11 +270,18 @@ class FeatureExtractor:
         
         return vector
     
-    def _update_event_history(self, event) -> None:
-        """Update event history for feature computation"""
+    def _update_event_history(self, event, cutoff: Optional[datetime] = None) -> None:
+        """
+        Update event history for feature computation.
+        
+        With a cutoff (batch mode) history was already pruned against it, so
+        only the new event needs checking and out-of-window events are never
+        stored; without one, the whole history is pruned afterwards.
+        """
         timestamp = datetime.fromisoformat(event.timestamp) if isinstance(event.timestamp, str) else datetime.now()
+        in_window = cutoff is None or timestamp > cutoff
         
-        if event.source_ip:
+        if event.source_ip and in_window:
             self.ip_events[event.source_ip].append({
                 'timestamp': timestamp,
                 'username': event.username,
@@ -148,11 +290,12 @@ class FeatureExtractor:
             })
         
         if event.username:
-            self.user_events[event.username].append({
-                'timestamp': timestamp,
-                'source_ip': event.source_ip,
-                'event_type': event.event_type,
-            })
+            if in_window:
+                self.user_events[event.username].append({
+                    'timestamp': timestamp,
+                    'source_ip': event.source_ip,
+                    'event_type': event.event_type,
+                })
             
             if event.event_type == 'login_success':
                 self.user_login_times[event.username].append(timestamp.hour + timestamp.minute / 60)
@@ -161,11 +304,13 @@ class FeatureExtractor:
                 self.user_known_ips[event.username].add(event.source_ip)
         
         # Cleanup old entries (outside window)
-        self._cleanup_old_events()
+        if cutoff is None:
+            self._cleanup_old_events()
     
-    def _cleanup_old_events(self) -> None:
+    def _cleanup_old_events(self, cutoff: Optional[datetime] = None) -> None:
         """Remove events outside the feature window"""
-        cutoff = datetime.now() - timedelta(minutes=self.window_minutes)
+        if cutoff is None:
+            cutoff = datetime.now() - timedelta(minutes=self.window_minutes)
         
         for ip in list(self.ip_events.keys()):
             self.ip_events[ip] = [
@@ -22,7 +22,15 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def build_feature_matrix(feature_vectors: List) -> np.ndarray:
+    """
+    Stack feature vectors into a contiguous (n_samples, n_features) float32
+    matrix - the dtype IsolationForest's trees operate on
+    """
+    return np.array([v.to_ml_vector() for v in feature_vectors], dtype=np.float32)
+
+
+@dataclass(slots=True, frozen=True)
 class AnomalyScore:
     """Anomaly detection result"""
     event_id: str
@@ -43,7 +51,8 @@ class IsolationForestModel:
         contamination: float = 0.1,
         n_estimators: int = 100,
         max_samples: int = 256,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: Optional[int] = None,
     ):
         if IsolationForest is None:
             raise ImportError("scikit-learn required for ML pipeline")
@@ -53,6 +62,7 @@ class IsolationForestModel:
             n_estimators=n_estimators,
             max_samples=max_samples,
             random_state=random_state,
+            n_jobs=n_jobs,
         )
         self.feature_names = [
             'ip_failed_logins',
@@ -90,47 +100,61 @@ class IsolationForestModel:
         Returns list of (score, is_anomaly) tuples.
         Score ranges from -1 (anomaly) to 1 (normal).
         """
+        normalized_scores, is_anomaly = self.score(feature_matrix)
+        return list(zip(normalized_scores.tolist(), is_anomaly.tolist()))
+    
+    def score(self, feature_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a feature matrix as arrays.
+        Returns (normalized scores in 0-1, boolean anomaly mask).
+        """
         feature_matrix = self._normalize_features(feature_matrix)
         
-        # Get anomaly scores (-1 for anomalies, 1 for normal)
-        predictions = self.model.predict(feature_matrix)
-        
-        # Get decision function scores (negative means anomaly)
+        # Score the whole matrix in one pass through the forest; predict()
+        # would walk every tree again just to threshold the same scores
         decision_scores = self.model.score_samples(feature_matrix)
         
-        results = []
-        for pred, score in zip(predictions, decision_scores):
-            is_anomaly = (pred == -1)
-            # Normalize score to 0-1 (0 = normal, 1 = anomaly)
-            normalized_score = 1 / (1 + np.exp(score))
-            results.append((float(normalized_score), is_anomaly))
+        # Anomalies fall below the fitted offset (what predict() returns as -1)
+        is_anomaly = decision_scores < self.model.offset_
         
-        return results
+        # Normalize score to 0-1 (0 = normal, 1 = anomaly)
+        normalized_scores = 1 / (1 + np.exp(decision_scores))
+        
+        return normalized_scores, is_anomaly
     
     def _normalize_features(self, X: np.ndarray, fit: bool = False) -> np.ndarray:
-        """Normalize features using z-score normalization"""
-        X = np.array(X, dtype=np.float64)
+        """Normalize features using z-score normalization (in float32)"""
+        # No copy for build_feature_matrix output, which is already float32
+        X = np.asarray(X, dtype=np.float32)
         
         if fit:
-            self.scaler_params = {
-                'mean': np.mean(X, axis=0),
-                'std': np.std(X, axis=0),
-            }
+            self.scaler_params = self._scaler_params(X)
         
         if self.scaler_params is None:
             logger.warning("Model not trained, using feature normalization")
-            self.scaler_params = {
-                'mean': np.mean(X, axis=0),
-                'std': np.std(X, axis=0),
-            }
+            self.scaler_params = self._scaler_params(X)
+        
+        # Stats from older saved models may be float64; cast so the
+        # arithmetic below stays float32
+        mean = np.asarray(self.scaler_params['mean'], dtype=np.float32)
+        std = np.array(self.scaler_params['std'], dtype=np.float32)
         
         # Avoid division by zero
-        std = self.scaler_params['std'].copy()
         std[std == 0] = 1
         
-        X_normalized = (X - self.scaler_params['mean']) / std
+        # One float32 result array, contiguous, handed to sklearn as-is
+        X_normalized = X - mean
+        X_normalized /= std
         return X_normalized
     
+    @staticmethod
+    def _scaler_params(X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-feature mean and std, accumulated in float64 and stored as float32"""
+        return {
+            'mean': np.mean(X, axis=0, dtype=np.float64).astype(np.float32),
+            'std': np.std(X, axis=0, dtype=np.float64).astype(np.float32),
+        }
+    
     def save(self, model_path: str) -> None:
         """Save model to disk"""
         data = {
@@ -184,19 +208,30 @@ class AnomalyDetector:
         self,
         feature_vectors: List,
         metadata: List[Dict],
+        feature_matrix: Optional[np.ndarray] = None,
+        anomalies_only: bool = False,
     ) -> List[AnomalyScore]:
-        """Detect anomalies in feature vectors"""
+        """
+        Detect anomalies in feature vectors.
+        A feature_matrix already built from feature_vectors (see
+        build_feature_matrix) is used as-is instead of being rebuilt.
+        With anomalies_only, only flagged rows are returned, and normal
+        rows are never explained or attributed.
+        """
         if not feature_vectors:
             return []
         
         # Convert to ML matrix
-        X = np.array([v.to_ml_vector() for v in feature_vectors])
+        X = feature_matrix if feature_matrix is not None else build_feature_matrix(feature_vectors)
         
         # Get predictions
-        predictions = self.model.predict(X)
+        scores, mask = self.model.score(X)
+        rows = np.flatnonzero(mask).tolist() if anomalies_only else range(len(scores))
+        scores, mask = scores.tolist(), mask.tolist()
         
         results = []
-        for i, (score, is_anomaly) in enumerate(predictions):
+        for i in rows:
+            score, is_anomaly = scores[i], mask[i]
             meta = metadata[i] if i < len(metadata) else {}
             vector = feature_vectors[i] if i < len(feature_vectors) else None
             
@@ -309,9 +344,14 @@ class MLPipeline:
         model_path: str = "/var/lib/devilnet/isolation_forest.pkl",
         contamination: float = 0.1,
         n_estimators: int = 100,
+        n_jobs: Optional[int] = None,
     ):
         self.model_path = model_path
-        self.model = IsolationForestModel(contamination=contamination, n_estimators=n_estimators)
+        self.model = IsolationForestModel(
+            contamination=contamination,
+            n_estimators=n_estimators,
+            n_jobs=n_jobs,
+        )
         self.detector = AnomalyDetector(self.model)
         self.is_trained = False
     
@@ -320,7 +360,7 @@ class MLPipeline:
         if len(feature_vectors) < 100:
             logger.warning("Small training dataset - model may overfit")
         
-        X = np.array([v.to_ml_vector() for v in feature_vectors])
+        X = build_feature_matrix(feature_vectors)
         self.model.train(X)
         self.is_trained = True
         self.save_model()
@@ -329,6 +369,8 @@ class MLPipeline:
         self,
         feature_vectors: List,
         metadata: List[Dict],
+        feature_matrix: Optional[np.ndarray] = None,
+        anomalies_only: bool = False,
     ) -> List[AnomalyScore]:
         """Run inference on new data"""
         if not self.is_trained:
@@ -336,7 +378,9 @@ class MLPipeline:
             if not self.load_model():
                 raise RuntimeError("Model not trained and cannot load from disk")
         
-        return self.detector.detect_anomalies(feature_vectors, metadata)
+        return self.detector.detect_anomalies(
+            feature_vectors, metadata, feature_matrix, anomalies_only=anomalies_only,
+        )
     
     def save_model(self) -> None:
         """Save trained model to disk"""
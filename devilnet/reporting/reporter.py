@@ -7,16 +7,35 @@ Generates machine-readable and human-readable incident reports.
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
 from datetime import datetime
+import atexit
 import json
 import logging
+import queue
+import threading
 from pathlib import Path
 
 from devilnet.core.mitre_mapping import MitreATTACKMapping, get_tactic_string
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _pretty_json(data) -> str:
+    """Serialize as 2-space indented JSON, via orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            # e.g. float subclasses orjson won't encode; json handles them
+            pass
+    return json.dumps(data, indent=2)
+
+
+@dataclass(slots=True, frozen=True)
 class IncidentReport:
     """Complete incident report"""
     incident_id: str
@@ -48,7 +67,7 @@ class IncidentReport:
     
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), indent=2)
+        return _pretty_json(self.to_dict())
     
     def to_human_readable(self) -> str:
         """Generate human-readable report"""
@@ -124,6 +143,13 @@ class IncidentReportGenerator:
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
         self.incident_counter = 0
+        
+        # Report files are written by a background thread so disk I/O
+        # stays off the detection path during anomaly bursts
+        self._writer_queue: queue.Queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.flush)
     
     def generate_report(
         self,
@@ -214,27 +240,41 @@ class IncidentReportGenerator:
         return report
     
     def save_json_report(self, report: IncidentReport) -> str:
-        """Save report as JSON"""
+        """Queue report for writing as JSON; call flush() before reading the returned path"""
         report_file = self.report_dir / f"{report.incident_id}.json"
-        
-        with open(report_file, 'w') as f:
-            f.write(report.to_json())
-        
-        logger.info(f"JSON report saved: {report_file}")
+        self._writer_queue.put((report_file, report.to_json().encode('utf-8')))
         return str(report_file)
     
     def save_text_report(self, report: IncidentReport) -> str:
-        """Save report as human-readable text"""
+        """Queue report for writing as human-readable text; call flush() before reading the returned path"""
         report_file = self.report_dir / f"{report.incident_id}.txt"
-        
-        with open(report_file, 'w') as f:
-            f.write(report.to_human_readable())
-        
-        logger.info(f"Text report saved: {report_file}")
+        self._writer_queue.put((report_file, report.to_human_readable().encode('utf-8')))
         return str(report_file)
     
+    def flush(self) -> None:
+        """Block until all queued reports have been written"""
+        self._writer_queue.join()
+    
+    def _writer_loop(self) -> None:
+        """Background loop writing queued reports to disk"""
+        while True:
+            report_file, content = self._writer_queue.get()
+            try:
+                with open(report_file, 'wb') as f:
+                    f.write(content)
+                logger.info("Report saved: %s", report_file)
+            except OSError as e:
+                logger.error("Failed to write report %s: %s", report_file, e)
+            finally:
+                self._writer_queue.task_done()
+    
     def save_report(self, report: IncidentReport, format: str = "both") -> Dict[str, str]:
-        """Save report in specified format"""
+        """
+        Queue report for writing in the specified format.
+        
+        Returns the paths the files will be written to. Writes happen on a
+        background thread, so call flush() before reading them.
+        """
         files = {}
         
         if format in ("json", "both"):
@@ -5,16 +5,53 @@ Performs controlled, logged, reversible automated responses to HIGH/CRITICAL inc
 No direct shell execution - only safe IPC-based actions with audit trails.
 """
 
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Callable
-from enum import Enum
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import List, Dict, Mapping, Optional, Callable, Tuple, Union
+from enum import Enum, IntEnum
+from datetime import date, datetime, time as dt_time, timedelta
+from collections import OrderedDict, deque
+import atexit
+import functools
+import heapq
+import itertools
 import json
 import logging
+import os
+import queue
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Queued to tell the audit log writer thread to exit / to drain the alert ring
+_WRITER_STOP = object()
+_WRITER_WAKE = object()
+
+_DISABLED_MSG = "Automated actions disabled (dry-run mode)"
+
+# Incident ids: per-process nonce in the high 32 bits, counter in the low 32
+_PROC_NONCE = (os.getpid() ^ int(time.time())) & 0xFFFFFFFF
+_EVENT_COUNTER = itertools.count()
+
+
+def _next_event_id() -> str:
+    """Return a compact, sortable 16-char hex incident id"""
+    return format((_PROC_NONCE << 32) | (next(_EVENT_COUNTER) & 0xFFFFFFFF), '016x')
+
+
+def _encode_log_line(data: Dict) -> bytes:
+    """Serialize an audit log entry as one compact JSON line"""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return (json.dumps(data, separators=(',', ':')) + '\n').encode('utf-8')
+
 
 class ResponseAction(Enum):
     """Automated response actions"""
@@ -26,7 +63,23 @@ class ResponseAction(Enum):
     ALERT_ONLY = "alert_only"
 
 
-@dataclass
+class Severity(IntEnum):
+    """Incident severity levels, ordered so thresholds compare as ints"""
+    NORMAL = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+    
+    @classmethod
+    def parse(cls, level: Union["Severity", str]) -> Optional["Severity"]:
+        """Convert a level name (e.g. "HIGH") to Severity; None if unknown"""
+        if isinstance(level, cls):
+            return level
+        return cls.__members__.get(level)
+
+
+@dataclass(slots=True, frozen=True)
 class IncidentResponseAction:
     """Describes a response action to be taken"""
     action_type: ResponseAction
@@ -36,15 +89,25 @@ class IncidentResponseAction:
     timestamp: str
     event_id: str
     is_reversible: bool = True
+    event_type: str = ""  # Triggering event, e.g. login_failed
+    source_ip: Optional[str] = None
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        result = asdict(self)
-        result['action_type'] = self.action_type.value
-        return result
+        return {
+            'action_type': self.action_type.value,
+            'target': self.target,
+            'reason': self.reason,
+            'severity': self.severity,
+            'timestamp': self.timestamp,
+            'event_id': self.event_id,
+            'is_reversible': self.is_reversible,
+            'event_type': self.event_type,
+            'source_ip': self.source_ip,
+        }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResponseLog:
     """Log entry for response action"""
     action: IncidentResponseAction
@@ -55,12 +118,110 @@ class ResponseLog:
     reversal_command: Optional[str] = None
 
 
+class BoundedActionHistory(OrderedDict):
+    """Insertion-ordered dict that evicts the least recently set keys past max_size"""
+    
+    def __init__(self, max_size: int = 50_000):
+        super().__init__()
+        self.max_size = max_size
+    
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class AlertCoalescer:
+    """
+    Suppresses repeats of the same alert within a time window.
+    The first occurrence passes through; repeats are only counted and
+    reported as a single summary once the window closes.
+    """
+    
+    def __init__(self, window_seconds: float = 5.0):
+        self.window_seconds = window_seconds
+        # key -> [window start (monotonic), suppressed count, last action]
+        self._entries: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+    
+    def offer(self, key: tuple, action: "IncidentResponseAction") -> bool:
+        """Return True if the alert should be recorded, False if suppressed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                entry[2] = action
+                return False
+            self._entries[key] = [time.monotonic(), 0, action]
+            return True
+    
+    def expire(self, force: bool = False) -> List[Tuple[int, "IncidentResponseAction"]]:
+        """
+        Evict closed windows (or all windows if force is set).
+        Returns (suppressed_count, last_action) for windows that had repeats.
+        """
+        cutoff = time.monotonic() - self.window_seconds
+        summaries = []
+        with self._lock:
+            for key, (started, count, action) in list(self._entries.items()):
+                if force or started <= cutoff:
+                    del self._entries[key]
+                    if count:
+                        summaries.append((count, action))
+        return summaries
+
+
 class CooldownManager:
     """Prevents action spam with configurable cooldowns"""
     
-    def __init__(self):
-        # Track last action per target
-        self.last_actions: Dict[str, Dict] = {}
+    # Keys are spread over independently locked stripes so checks for
+    # unrelated targets don't contend on one lock
+    LOCK_STRIPES = 64
+    
+    # Entries are kept at least this long (the longest default cooldown),
+    # or longer if a longer cooldown has been checked
+    MIN_RETENTION_SECONDS = 600
+    
+    def __init__(self, max_tracked_targets: int = 50_000):
+        # Monotonic time of last action per target, one bounded history per
+        # stripe so target floods can't exhaust memory
+        self._per_stripe = max(1, max_tracked_targets // self.LOCK_STRIPES)
+        self._stripes = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._buckets: List[Dict[str, float]] = [
+            BoundedActionHistory(self._per_stripe) for _ in range(self.LOCK_STRIPES)
+        ]
+        # Per-stripe min-heaps of (action time, key); entries whose time no
+        # longer matches the bucket are stale and skipped when popped
+        self._heaps: List[List[Tuple[float, str]]] = [[] for _ in range(self.LOCK_STRIPES)]
+        self._retention = float(self.MIN_RETENTION_SECONDS)
+    
+    def _stripe(self, key: str) -> Tuple[threading.Lock, Dict[str, float], List[Tuple[float, str]]]:
+        """Return the lock, history bucket and expiry heap that own a key"""
+        idx = hash(key) & (self.LOCK_STRIPES - 1)
+        return self._stripes[idx], self._buckets[idx], self._heaps[idx]
+    
+    def _note_cooldown(self, cooldown_seconds: float) -> None:
+        """Widen retention so entries outlive the longest cooldown in use"""
+        if cooldown_seconds > self._retention:
+            self._retention = float(cooldown_seconds)
+    
+    def _record(self, bucket: Dict[str, float], heap: List[Tuple[float, str]], key: str, now: float) -> None:
+        """Record an action time and expire entries past retention (stripe lock held)"""
+        bucket[key] = now
+        heapq.heappush(heap, (now, key))
+        
+        cutoff = now - self._retention
+        while heap and heap[0][0] <= cutoff:
+            recorded_at, expired_key = heapq.heappop(heap)
+            if bucket.get(expired_key) == recorded_at:
+                del bucket[expired_key]
+        
+        # Repeated or evicted keys leave stale heap entries; rebuild from the
+        # bucket before they outnumber the live ones
+        if len(heap) > 2 * self._per_stripe:
+            heap[:] = [(recorded_at, k) for k, recorded_at in bucket.items()]
+            heapq.heapify(heap)
     
     def should_allow_action(
         self,
@@ -69,23 +230,39 @@ class CooldownManager:
         cooldown_seconds: int,
     ) -> bool:
         """Check if action is allowed given cooldown policy"""
+        self._note_cooldown(cooldown_seconds)
         key = f"{action_type.value}:{target}"
-        
-        if key not in self.last_actions:
-            return True
-        
-        last_action_time = datetime.fromisoformat(self.last_actions[key]['timestamp'])
-        elapsed = (datetime.now() - last_action_time).total_seconds()
-        
-        return elapsed >= cooldown_seconds
+        lock, bucket, _ = self._stripe(key)
+        with lock:
+            last_action_time = bucket.get(key, float('-inf'))
+        return time.monotonic() - last_action_time >= cooldown_seconds
     
     def record_action(self, action_type: ResponseAction, target: str) -> None:
         """Record that an action was performed"""
         key = f"{action_type.value}:{target}"
-        self.last_actions[key] = {
-            'timestamp': datetime.now().isoformat(),
-            'target': target,
-        }
+        lock, bucket, heap = self._stripe(key)
+        with lock:
+            self._record(bucket, heap, key, time.monotonic())
+    
+    def try_acquire(
+        self,
+        action_type: ResponseAction,
+        target: str,
+        cooldown_seconds: int,
+    ) -> bool:
+        """
+        Atomically check the cooldown and record the action if allowed.
+        Concurrent callers for the same target cannot both succeed.
+        """
+        self._note_cooldown(cooldown_seconds)
+        key = f"{action_type.value}:{target}"
+        lock, bucket, heap = self._stripe(key)
+        with lock:
+            now = time.monotonic()
+            if now - bucket.get(key, float('-inf')) < cooldown_seconds:
+                return False
+            self._record(bucket, heap, key, now)
+            return True
 
 
 class SafeResponseExecutor:
@@ -94,25 +271,69 @@ class SafeResponseExecutor:
     All actions logged, auditable, and reversible where possible.
     """
     
+    # Audit log queueing policy: entries beyond LOG_QUEUE_MAX_SIZE are dropped
+    # (and counted) rather than growing memory without bound under attack
+    LOG_QUEUE_MAX_SIZE = 10_000
+    LOG_WRITE_BATCH_SIZE = 256
+    LOG_FILE_MODE = 0o640
+    LOG_WRITEV_MAX_SEGMENTS = 1024  # Conservative IOV_MAX
+    DROP_WARNING_INTERVAL_SECONDS = 1.0
+    WRITER_MIN_WAIT_SECONDS = 0.01  # Keeps flush_interval_ms=0 from busy-spinning
+    
+    # ALERT_ONLY actions skip cooldown and handler dispatch; they are held in
+    # a ring buffer and written by the writer thread in batches
+    ALERT_RING_SIZE = 1024
+    ALERT_FLUSH_BATCH_SIZE = 100
+    ALERT_FLUSH_INTERVAL_SECONDS = 1.0
+    ALERT_COALESCE_WINDOW_SECONDS = 5.0
+    
     def __init__(
         self,
         response_log_dir: str = "/var/log/devilnet/responses",
         enable_actions: bool = False,
+        max_unflushed_events: int = 1000,
+        flush_interval_ms: int = 500,
     ):
         self.response_log_dir = Path(response_log_dir)
         self.response_log_dir.mkdir(parents=True, exist_ok=True)
         self.enable_actions = enable_actions
+        # Group commit policy: fdatasync once this many entries are unsynced
+        # or once flush_interval_ms has passed since the last sync
+        self.max_unflushed_events = max_unflushed_events
+        self.flush_interval_ms = flush_interval_ms
         self.cooldown_manager = CooldownManager()
         
-        # Action handlers - can be overridden in testing
-        self.handlers: Dict[ResponseAction, Callable] = {
+        # Action handlers - override via register_handler() in testing;
+        # ALERT_ONLY never dispatches, it goes straight to the alert ring
+        self._handlers: Dict[ResponseAction, Callable] = {
             ResponseAction.LOCK_ACCOUNT: self._handle_lock_account,
             ResponseAction.UNLOCK_ACCOUNT: self._handle_unlock_account,
             ResponseAction.BLOCK_IP: self._handle_block_ip,
             ResponseAction.UNBLOCK_IP: self._handle_unblock_ip,
             ResponseAction.TERMINATE_SESSION: self._handle_terminate_session,
-            ResponseAction.ALERT_ONLY: self._handle_alert_only,
         }
+        
+        # Audit log state - entries are queued and written in batches by a
+        # background thread through a long-lived O_APPEND descriptor
+        self._log_queue: queue.Queue = queue.Queue(maxsize=self.LOG_QUEUE_MAX_SIZE)
+        self._log_fd: Optional[int] = None
+        self._log_rotate_at = 0.0  # Epoch time of next local midnight
+        self._unsynced_events = 0
+        self._last_sync = time.monotonic()
+        self.dropped_responses = 0
+        self._last_drop_warning = 0.0
+        self._alert_ring: deque = deque(maxlen=self.ALERT_RING_SIZE)
+        self._alert_wake_pending = threading.Event()
+        self._alert_coalescer = AlertCoalescer(self.ALERT_COALESCE_WINDOW_SECONDS)
+        self._next_coalesce_sweep = 0.0
+        # Held while checking _closed and queueing, so nothing is queued
+        # behind the writer's stop marker
+        self._close_lock = threading.Lock()
+        self._closed = False
+        self._closed_write_lock = threading.Lock()
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.close)
     
     def execute_response(
         self,
@@ -121,34 +342,41 @@ class SafeResponseExecutor:
     ) -> ResponseLog:
         """Execute a response action with safety checks"""
         
-        # Check cooldown
-        if not self.cooldown_manager.should_allow_action(
-            action.action_type,
-            action.target,
-            cooldown_seconds
-        ):
+        # Fast path: alerts have nothing to rate-limit or reverse
+        if action.action_type is ResponseAction.ALERT_ONLY:
+            return self._record_alert(action)
+        
+        # Check if actions are enabled
+        if not self.enable_actions:
+            logger.warning(
+                "Response action %s blocked (actions disabled in config)",
+                action.action_type.value,
+            )
+            # Refused immediately, so the decision timestamp stands in for
+            # executed_at; dry-run entries are never written to the audit log
             return ResponseLog(
                 action=action,
                 success=False,
-                result_message=f"Action blocked by cooldown (cooldown: {cooldown_seconds}s)",
-                executed_at=datetime.now().isoformat(),
+                result_message=_DISABLED_MSG,
+                executed_at=action.timestamp,
             )
         
-        # Check if actions are enabled
-        if not self.enable_actions and action.action_type != ResponseAction.ALERT_ONLY:
-            logger.warning(
-                f"Response action {action.action_type.value} blocked (actions disabled in config)"
-            )
+        # Check and claim cooldown in one step
+        if not self.cooldown_manager.try_acquire(
+            action.action_type,
+            action.target,
+            cooldown_seconds
+        ):
             return ResponseLog(
                 action=action,
                 success=False,
-                result_message="Automated actions disabled (dry-run mode)",
+                result_message=f"Action blocked by cooldown (cooldown: {cooldown_seconds}s)",
                 executed_at=datetime.now().isoformat(),
             )
         
         # Execute handler
         try:
-            handler = self.handlers[action.action_type]
+            handler = self._handlers[action.action_type]
             result_message, reversal_cmd = handler(action)
             
             # Record in audit log
@@ -161,13 +389,16 @@ class SafeResponseExecutor:
             )
             
             self._write_response_log(log_entry)
-            self.cooldown_manager.record_action(action.action_type, action.target)
             
-            logger.info(f"Response action executed: {action.action_type.value} on {action.target}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Response action executed: %s on %s",
+                    action.action_type.value, action.target,
+                )
             return log_entry
         
         except Exception as e:
-            logger.error(f"Response action failed: {e}")
+            logger.error("Response action failed: %s", e)
             log_entry = ResponseLog(
                 action=action,
                 success=False,
@@ -177,6 +408,17 @@ class SafeResponseExecutor:
             self._write_response_log(log_entry)
             return log_entry
     
+    @property
+    def handlers(self) -> Mapping[ResponseAction, Callable]:
+        """Read-only view of the action handlers; use register_handler() to change one"""
+        return MappingProxyType(self._handlers)
+    
+    def register_handler(self, action_type: ResponseAction, handler: Callable) -> None:
+        """Replace the handler for an action type"""
+        if action_type not in self._handlers:
+            raise ValueError(f"{action_type.value} actions are not dispatched to a handler")
+        self._handlers[action_type] = handler
+    
     def _handle_lock_account(self, action: IncidentResponseAction) -> tuple[str, Optional[str]]:
         """Lock a user account (disable login)"""
         username = action.target
@@ -239,29 +481,246 @@ class SafeResponseExecutor:
         
         return result, None
     
-    def _handle_alert_only(self, action: IncidentResponseAction) -> tuple[str, Optional[str]]:
-        """Generate alert without taking action"""
-        result = f"Alert: {action.reason}"
-        logger.warning(result)
-        return result, None
+    def _record_alert(self, action: IncidentResponseAction) -> ResponseLog:
+        """Log an alert and hand it to the writer thread via the alert ring"""
+        key = (action.event_type, action.source_ip, action.target)
+        if not self._alert_coalescer.offer(key, action):
+            return ResponseLog(
+                action=action,
+                success=True,
+                result_message="Alert coalesced (duplicate within window)",
+                executed_at=datetime.now().isoformat(),
+            )
+        
+        result_message = f"Alert: {action.reason}"
+        logger.warning(result_message)
+        
+        log_entry = ResponseLog(
+            action=action,
+            success=True,
+            result_message=result_message,
+            executed_at=datetime.now().isoformat(),
+        )
+        self._append_alert(log_entry)
+        return log_entry
+    
+    def _append_alert(self, log_entry: ResponseLog) -> None:
+        """Buffer an alert entry and wake the writer once a batch is ready"""
+        with self._close_lock:
+            closed = self._closed and threading.current_thread() is not self._writer_thread
+            if not closed:
+                self._alert_ring.append(log_entry)
+        if closed:
+            self._write_after_close(self._encode_response_log(log_entry))
+            return
+        
+        if (len(self._alert_ring) >= self.ALERT_FLUSH_BATCH_SIZE
+                and not self._alert_wake_pending.is_set()):
+            self._alert_wake_pending.set()
+            try:
+                self._log_queue.put_nowait(_WRITER_WAKE)
+            except queue.Full:
+                pass  # Writer is busy and will drain the ring on its next batch
+    
+    def _emit_alert_summaries(self, force: bool = False) -> None:
+        """Record one summary entry for each closed window that had repeats"""
+        for count, action in self._alert_coalescer.expire(force=force):
+            result_message = (
+                f"Alert repeated {count} more times in "
+                f"{self.ALERT_COALESCE_WINDOW_SECONDS:g}s: {action.reason}"
+            )
+            logger.warning(result_message)
+            self._append_alert(ResponseLog(
+                action=action,
+                success=True,
+                result_message=result_message,
+                executed_at=datetime.now().isoformat(),
+            ))
     
     def _write_response_log(self, log_entry: ResponseLog) -> None:
-        """Write response action to audit log"""
-        log_file = self.response_log_dir / f"responses_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        """Queue response action for the audit log"""
+        record = self._encode_response_log(log_entry)
+        with self._close_lock:
+            closed = self._closed
+            if not closed:
+                try:
+                    self._log_queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    pass
+        if closed:
+            self._write_after_close(record)
+            return
         
+        self.dropped_responses += 1
+        now = time.monotonic()
+        if now - self._last_drop_warning >= self.DROP_WARNING_INTERVAL_SECONDS:
+            self._last_drop_warning = now
+            logger.warning(
+                "Response log queue full, dropping entries (%d dropped so far)",
+                self.dropped_responses,
+            )
+    
+    def _encode_response_log(self, log_entry: ResponseLog) -> bytes:
+        """Serialize a response log entry as one JSONL record"""
+        data = {
+            'action': log_entry.action.to_dict(),
+            'success': log_entry.success,
+            'result_message': log_entry.result_message,
+            'executed_at': log_entry.executed_at,
+            'executed_by': log_entry.executed_by,
+            'reversal_command': log_entry.reversal_command,
+        }
+        return _encode_log_line(data)
+    
+    def flush(self) -> None:
+        """Block until all queued audit log entries and alerts are written to the log file"""
+        if self._closed:
+            return  # Entries logged after close() are written synchronously
+        self._log_queue.put(_WRITER_WAKE)
+        self._log_queue.join()
+    
+    def close(self) -> None:
+        """Drain the audit log queue, stop the writer thread and sync and close the log file"""
+        if self._closed:
+            return
+        self._emit_alert_summaries(force=True)
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._log_queue.put(_WRITER_STOP)
+        self._writer_thread.join()
+        atexit.unregister(self.close)
+    
+    def _write_after_close(self, record: bytes) -> None:
+        """Write one entry synchronously once the writer thread has stopped"""
+        self._writer_thread.join()
+        with self._closed_write_lock:
+            self._write_batch([record])
+            self._close_log_fd()
+    
+    def _writer_loop(self) -> None:
+        """Background loop draining the audit log queue and alert ring in batches"""
+        wait_timeout = max(
+            self.WRITER_MIN_WAIT_SECONDS,
+            min(self.ALERT_FLUSH_INTERVAL_SECONDS, self.flush_interval_ms / 1000.0),
+        )
+        while True:
+            # Wait for the first entry (or the flush interval), then take
+            # whatever else is already queued
+            try:
+                batch = [self._log_queue.get(timeout=wait_timeout)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.LOG_WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            now = time.monotonic()
+            if now >= self._next_coalesce_sweep:
+                self._next_coalesce_sweep = now + self.ALERT_FLUSH_INTERVAL_SECONDS
+                self._emit_alert_summaries()
+            
+            records = self._drain_alert_ring()
+            records.extend(record for record in batch if isinstance(record, bytes))
+            if records:
+                self._write_batch(records)
+            self._maybe_sync(now)
+            for _ in batch:
+                self._log_queue.task_done()
+            
+            if any(record is _WRITER_STOP for record in batch):
+                self._close_log_fd()
+                return
+    
+    def _drain_alert_ring(self) -> List[bytes]:
+        """Pop and encode all buffered alerts"""
+        self._alert_wake_pending.clear()
+        records = []
+        while self._alert_ring:
+            try:
+                log_entry = self._alert_ring.popleft()
+            except IndexError:
+                break
+            records.append(self._encode_response_log(log_entry))
+        return records
+    
+    def _write_batch(self, batch: List[bytes]) -> None:
+        """Append a batch of encoded entries to the current day's log file"""
         try:
-            with open(log_file, 'a') as f:
-                data = {
-                    'action': log_entry.action.to_dict(),
-                    'success': log_entry.success,
-                    'result_message': log_entry.result_message,
-                    'executed_at': log_entry.executed_at,
-                    'executed_by': log_entry.executed_by,
-                    'reversal_command': log_entry.reversal_command,
-                }
-                f.write(json.dumps(data) + '\n')
+            if time.time() >= self._log_rotate_at:
+                self._open_daily_log()
+            
+            for start in range(0, len(batch), self.LOG_WRITEV_MAX_SEGMENTS):
+                self._write_all(batch[start:start + self.LOG_WRITEV_MAX_SEGMENTS])
+            self._unsynced_events += len(batch)
         except Exception as e:
-            logger.error(f"Failed to write response log: {e}")
+            logger.error("Failed to write response log: %s", e)
+    
+    def _write_all(self, chunks: List[bytes]) -> None:
+        """Write chunks to the log descriptor, resuming after partial writes"""
+        if not hasattr(os, 'writev'):
+            # Windows: no vectored I/O, fall back to one joined write
+            chunks = [b''.join(chunks)]
+        while chunks:
+            if hasattr(os, 'writev'):
+                written = os.writev(self._log_fd, chunks)
+            else:
+                written = os.write(self._log_fd, chunks[0])
+            # Skip fully written chunks and trim a partially written one
+            while chunks and written >= len(chunks[0]):
+                written -= len(chunks[0])
+                chunks = chunks[1:]
+            if chunks and written:
+                chunks = [chunks[0][written:]] + chunks[1:]
+    
+    def _maybe_sync(self, now: float) -> None:
+        """Group commit: sync after max_unflushed_events or flush_interval_ms"""
+        if not self._unsynced_events:
+            self._last_sync = now
+            return
+        if (
+            self._unsynced_events >= self.max_unflushed_events
+            or (now - self._last_sync) * 1000.0 >= self.flush_interval_ms
+        ):
+            self._sync_log_fd()
+            self._last_sync = now
+    
+    def _sync_log_fd(self) -> None:
+        """Flush written entries to stable storage"""
+        if self._log_fd is None or not self._unsynced_events:
+            return
+        try:
+            if hasattr(os, 'fdatasync'):
+                os.fdatasync(self._log_fd)
+            else:
+                os.fsync(self._log_fd)
+        except OSError as e:
+            logger.error("Failed to sync response log: %s", e)
+        self._unsynced_events = 0
+    
+    def _close_log_fd(self) -> None:
+        """Sync and close the current log file, if open"""
+        if self._log_fd is None:
+            return
+        self._sync_log_fd()
+        os.close(self._log_fd)
+        self._log_fd = None
+    
+    def _open_daily_log(self) -> None:
+        """Open today's log file and compute when it must next be rotated"""
+        self._close_log_fd()
+        
+        today = date.today()
+        log_file = self.response_log_dir / f"responses_{today.isoformat()}.jsonl"
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self._log_fd = os.open(log_file, flags, self.LOG_FILE_MODE)
+        
+        next_midnight = datetime.combine(today + timedelta(days=1), dt_time.min)
+        self._log_rotate_at = next_midnight.timestamp()
 
 
 class ResponseDecisionEngine:
@@ -269,80 +728,82 @@ class ResponseDecisionEngine:
     
     def __init__(
         self,
-        lock_account_threshold: str = "HIGH",
-        block_ip_threshold: str = "HIGH",
-        terminate_threshold: str = "CRITICAL",
+        lock_account_threshold: Union[Severity, str] = Severity.HIGH,
+        block_ip_threshold: Union[Severity, str] = Severity.HIGH,
+        terminate_threshold: Union[Severity, str] = Severity.CRITICAL,
     ):
-        self.lock_account_threshold = lock_account_threshold
-        self.block_ip_threshold = block_ip_threshold
-        self.terminate_threshold = terminate_threshold
+        # Thresholds resolved once; unknown thresholds are never met
+        self.lock_account_threshold = self._threshold(lock_account_threshold)
+        self.block_ip_threshold = self._threshold(block_ip_threshold)
+        self.terminate_threshold = self._threshold(terminate_threshold)
         
         # Risk level hierarchy
-        self.severity_levels = ["NORMAL", "LOW", "MEDIUM", "HIGH", "CRITICAL"]
+        self.severity_levels = [level.name for level in Severity]
+    
+    @staticmethod
+    def _threshold(level: Union[Severity, str]) -> int:
+        """Resolve a threshold level, mapping unknown names above CRITICAL"""
+        severity = Severity.parse(level)
+        return severity if severity is not None else Severity.CRITICAL + 1
     
     def determine_response(
         self,
-        risk_level: str,
+        risk_level: Union[Severity, str],
         event_type: str,
         anomaly_score: float,
         source_ip: str,
         username: str,
     ) -> List[IncidentResponseAction]:
         """Determine appropriate response actions"""
-        actions = []
         timestamp = datetime.now().isoformat()
-        event_id = f"{source_ip}_{username}_{timestamp}"
+        event_id = _next_event_id()
+        
+        # Unknown risk levels still alert but never meet an action threshold
+        severity = Severity.parse(risk_level)
+        if severity is not None:
+            level, severity_name = severity, severity.name
+        else:
+            level, severity_name = -1, str(risk_level)
+        
+        # Fields shared by every action for this incident
+        make_action = functools.partial(
+            IncidentResponseAction,
+            severity=severity_name,
+            timestamp=timestamp,
+            event_id=event_id,
+            event_type=event_type,
+            source_ip=source_ip,
+        )
         
         # Always generate alert
-        actions.append(IncidentResponseAction(
+        actions = [make_action(
             action_type=ResponseAction.ALERT_ONLY,
             target=username,
             reason=f"Anomaly detected: {event_type} (score: {anomaly_score:.2f})",
-            severity=risk_level,
-            timestamp=timestamp,
-            event_id=event_id,
-        ))
+        )]
         
         # Block IP for HIGH or CRITICAL
-        if self._meets_threshold(risk_level, self.block_ip_threshold):
-            actions.append(IncidentResponseAction(
+        if level >= self.block_ip_threshold:
+            actions.append(make_action(
                 action_type=ResponseAction.BLOCK_IP,
                 target=source_ip,
                 reason=f"Blocking IP after {event_type}",
-                severity=risk_level,
-                timestamp=timestamp,
-                event_id=event_id,
             ))
         
         # Lock account for HIGH or CRITICAL
-        if self._meets_threshold(risk_level, self.lock_account_threshold):
-            actions.append(IncidentResponseAction(
+        if level >= self.lock_account_threshold:
+            actions.append(make_action(
                 action_type=ResponseAction.LOCK_ACCOUNT,
                 target=username,
                 reason=f"Locking account after {event_type}",
-                severity=risk_level,
-                timestamp=timestamp,
-                event_id=event_id,
             ))
         
         # Terminate session for CRITICAL
-        if self._meets_threshold(risk_level, self.terminate_threshold):
-            actions.append(IncidentResponseAction(
+        if level >= self.terminate_threshold:
+            actions.append(make_action(
                 action_type=ResponseAction.TERMINATE_SESSION,
                 target=username,
                 reason=f"Terminating sessions for {username} (CRITICAL)",
-                severity=risk_level,
-                timestamp=timestamp,
-                event_id=event_id,
             ))
         
         return actions
-    
-    def _meets_threshold(self, current_level: str, threshold_level: str) -> bool:
-        """Check if current level meets or exceeds threshold"""
-        try:
-            current_idx = self.severity_levels.index(current_level)
-            threshold_idx = self.severity_levels.index(threshold_level)
-            return current_idx >= threshold_idx
-        except ValueError:
-            return False
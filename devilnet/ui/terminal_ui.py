@@ -6,14 +6,15 @@ Uses threading to handle alerts independently from user input/menu navigation.
 """
 
 import curses
+import itertools
 import threading
 import time
-import queue
 import logging
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
+from collections import deque
 import json
 
 logger = logging.getLogger(__name__)
@@ -27,22 +28,29 @@ class AlertLevel(Enum):
     SUCCESS = "SUCCESS"
 
 
-@dataclass
+# Icon shown between an alert's time and message
+_LEVEL_ICON = {
+    AlertLevel.INFO: "ℹ️",
+    AlertLevel.WARNING: "⚠️",
+    AlertLevel.CRITICAL: "🔴",
+    AlertLevel.SUCCESS: "✅",
+}
+
+
+@dataclass(frozen=True)
 class Alert:
     """Alert notification"""
     message: str
     level: AlertLevel
     timestamp: datetime
     
+    def __post_init__(self) -> None:
+        # Display line, built once per alert and reused every frame
+        icon = _LEVEL_ICON.get(self.level, "•")
+        object.__setattr__(self, 'rendered', f"[{self.timestamp:%H:%M:%S}] {icon} {self.message}")
+    
     def __str__(self) -> str:
-        time_str = self.timestamp.strftime("%H:%M:%S")
-        level_icon = {
-            AlertLevel.INFO: "ℹ️",
-            AlertLevel.WARNING: "⚠️",
-            AlertLevel.CRITICAL: "🔴",
-            AlertLevel.SUCCESS: "✅",
-        }.get(self.level, "•")
-        return f"[{time_str}] {level_icon} {self.message}"
+        return self.rendered
 
 
 class MenuItem:
@@ -61,99 +69,76 @@ class Menu:
     def __init__(self, title: str, items: List[MenuItem]):
         self.title = title
         self.items = items
-        self.current_selection = 0
-    
-    def get_selectable_items(self) -> List[MenuItem]:
+        # Items are fixed at construction, so selectable entries are cached;
+        # navigation moves a cursor over their indices
+        self._separator_mask = tuple(item.is_separator for item in items)
+        self._selectable = tuple(item for item in items if not item.is_separator)
+        self._selectable_idx = [i for i, is_sep in enumerate(self._separator_mask) if not is_sep]
+        self._cursor = 0
+    
+    @property
+    def current_selection(self) -> int:
+        """Index into items of the selected entry"""
+        if not self._selectable_idx:
+            return 0
+        return self._selectable_idx[self._cursor]
+    
+    def get_selectable_items(self) -> Tuple[MenuItem, ...]:
         """Get non-separator items"""
-        return [item for item in self.items if not item.is_separator]
+        return self._selectable
     
     def move_up(self) -> None:
         """Move selection up"""
-        selectable = self.get_selectable_items()
-        if not selectable:
-            return
-        
-        current_idx = 0
-        for i, item in enumerate(selectable):
-            if item == self.items[self.current_selection]:
-                current_idx = i
-                break
-        
-        current_idx = (current_idx - 1) % len(selectable)
-        self.current_selection = self.items.index(selectable[current_idx])
+        if self._selectable_idx:
+            self._cursor = (self._cursor - 1) % len(self._selectable_idx)
     
     def move_down(self) -> None:
         """Move selection down"""
-        selectable = self.get_selectable_items()
-        if not selectable:
-            return
-        
-        current_idx = 0
-        for i, item in enumerate(selectable):
-            if item == self.items[self.current_selection]:
-                current_idx = i
-                break
-        
-        current_idx = (current_idx + 1) % len(selectable)
-        self.current_selection = self.items.index(selectable[current_idx])
+        if self._selectable_idx:
+            self._cursor = (self._cursor + 1) % len(self._selectable_idx)
     
     def get_current_item(self) -> Optional[MenuItem]:
         """Get currently selected item"""
-        if 0 <= self.current_selection < len(self.items):
-            return self.items[self.current_selection]
-        return None
+        if not self._selectable_idx:
+            return None
+        return self.items[self._selectable_idx[self._cursor]]
 
 
 class AlertQueue:
-    """Thread-safe alert queue"""
+    """Thread-safe bounded alert buffer; the oldest alerts are evicted when full"""
     
     def __init__(self, max_size: int = 100):
-        self.queue: queue.Queue = queue.Queue(maxsize=max_size)
-        self.lock = threading.Lock()
+        self._dq: deque = deque(maxlen=max_size)
+        self._lock = threading.Lock()
     
     def put(self, alert: Alert) -> None:
         """Add alert to queue (non-blocking)"""
-        try:
-            self.queue.put_nowait(alert)
-        except queue.Full:
-            # Remove oldest alert if queue full
-            try:
-                self.queue.get_nowait()
-                self.queue.put_nowait(alert)
-            except queue.Empty:
-                pass
+        with self._lock:
+            self._dq.append(alert)
+    
+    def extend(self, alerts: List[Alert]) -> None:
+        """Add several alerts under a single lock acquisition"""
+        with self._lock:
+            self._dq.extend(alerts)
     
     def get_all(self) -> List[Alert]:
         """Get all pending alerts"""
-        alerts = []
-        while True:
-            try:
-                alerts.append(self.queue.get_nowait())
-            except queue.Empty:
-                break
+        with self._lock:
+            alerts = list(self._dq)
+            self._dq.clear()
         return alerts
     
+    def peek_recent(self, count: int = 10) -> List[Alert]:
+        """Return the newest alerts, oldest first, without mutating the queue"""
+        if count <= 0:
+            return []
+        with self._lock:
+            size = len(self._dq)
+            return list(itertools.islice(self._dq, max(0, size - count), size))
+    
     def get_recent(self, count: int = 10) -> List[Alert]:
         """Get recent alerts (without removing)"""
-        alerts = []
-        temp_alerts = []
-        
-        while len(alerts) < count:
-            try:
-                alert = self.queue.get_nowait()
-                alerts.append(alert)
-                temp_alerts.append(alert)
-            except queue.Empty:
-                break
-        
-        # Put alerts back
-        for alert in reversed(temp_alerts):
-            try:
-                self.queue.put_nowait(alert)
-            except queue.Full:
-                pass
-        
-        return alerts
+        return self.peek_recent(count)
 
 
 class InteractiveUI:
@@ -165,6 +150,8 @@ class InteractiveUI:
         self.alert_queue = AlertQueue()
         self.screen = None
         self.lock = threading.Lock()
+        # Set whenever alerts or metrics change so the renderer redraws
+        self._dirty = threading.Event()
         
         # Performance metrics
         self.metrics = {
@@ -175,6 +162,7 @@ class InteractiveUI:
             'uptime_seconds': 0,
         }
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
     
     def initialize_menu(self) -> Menu:
         """Create main menu"""
@@ -230,12 +218,38 @@ class InteractiveUI:
         self.running = False
         self.add_alert("Shutting down gracefully...", AlertLevel.WARNING)
     
-    def add_alert(self, message: str, level: AlertLevel = AlertLevel.INFO) -> None:
-        """Add alert to queue (thread-safe)"""
-        alert = Alert(message=message, level=level, timestamp=datetime.now())
+    def add_alert(
+        self,
+        message: str,
+        level: AlertLevel = AlertLevel.INFO,
+        *,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Add alert to queue (thread-safe); callers may pass a shared timestamp"""
+        if timestamp is None:
+            timestamp = datetime.now()
+        alert = Alert(message=message, level=level, timestamp=timestamp)
         self.alert_queue.put(alert)
-        self.metrics['alerts_total'] += 1
-        logger.debug(f"Alert queued: {message}")
+        with self.lock:
+            self.metrics['alerts_total'] += 1
+        self._dirty.set()
+        logger.debug("Alert queued: %s", message)
+    
+    def add_alerts_batch(
+        self,
+        alerts: List[Tuple[str, AlertLevel]],
+        *,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Add several (message, level) alerts at once (thread-safe)"""
+        if timestamp is None:
+            timestamp = datetime.now()
+        new_alerts = [Alert(message=message, level=level, timestamp=timestamp) for message, level in alerts]
+        self.alert_queue.extend(new_alerts)
+        with self.lock:
+            self.metrics['alerts_total'] += len(new_alerts)
+        self._dirty.set()
+        logger.debug("Alerts queued: %d", len(new_alerts))
     
     def update_metrics(self, **kwargs) -> None:
         """Update performance metrics (thread-safe)"""
@@ -246,12 +260,14 @@ class InteractiveUI:
                         self.metrics[key] += value if isinstance(value, int) else 1
                     else:
                         self.metrics[key] = value
+        self._dirty.set()
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics"""
-        with self.lock:
-            uptime = (datetime.now() - self.start_time).total_seconds()
-            return {**self.metrics, 'uptime_seconds': int(uptime)}
+        # Lock-free: copying the dict is a single step under the GIL, and
+        # readers don't need consistency across keys
+        uptime = time.monotonic() - self._start_monotonic
+        return {**self.metrics, 'uptime_seconds': int(uptime)}
 
 
 class TerminalRenderer:
@@ -260,12 +276,24 @@ class TerminalRenderer:
     def __init__(self, ui: InteractiveUI):
         self.ui = ui
         self.max_alert_lines = 10
+        # One curses window per screen region, laid out on resize; regions
+        # too small for the terminal are None
+        self._windows: Dict[str, Any] = {}
+        # Per-level alert attributes, built once the color pairs exist
+        self._alert_colors: Dict[AlertLevel, int] = {}
+        self._default_alert_color = 0
+        # Selected / unselected menu item attributes, also built at startup
+        self._menu_sel_attr = 0
+        self._menu_norm_attr = 0
+        # Cells drawn per region on the last frame; regions whose cells are
+        # unchanged are not redrawn
+        self._last_regions: Dict[str, Tuple] = {}
+        self._last_metrics: Optional[Tuple] = None
     
     def render(self, stdscr: Any) -> None:
         """Main render loop"""
-        curses.curs_set(0)  # Hide cursor
-        stdscr.nodelay(1)   # Non-blocking input
-        stdscr.timeout(100) # 100ms timeout
+        curses.curs_set(0)   # Hide cursor
+        stdscr.timeout(1000) # Wake at least once a second for the uptime tick
         
         # Color pairs
         curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
@@ -273,135 +301,238 @@ class TerminalRenderer:
         curses.init_pair(3, curses.COLOR_RED, curses.COLOR_BLACK)
         curses.init_pair(4, curses.COLOR_CYAN, curses.COLOR_BLACK)
         curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_BLACK)
+        self._alert_colors = {
+            AlertLevel.INFO: curses.color_pair(4),
+            AlertLevel.WARNING: curses.color_pair(2),
+            AlertLevel.CRITICAL: curses.color_pair(3),
+            AlertLevel.SUCCESS: curses.color_pair(1),
+        }
+        self._default_alert_color = curses.color_pair(5)
+        self._menu_sel_attr = curses.A_REVERSE | curses.A_BOLD | curses.color_pair(4)
+        self._menu_norm_attr = curses.A_NORMAL | curses.color_pair(5)
         
         menu = self.ui.initialize_menu()
+        size = None
+        last_frame = None
         
-        while self.ui.running:
-            stdscr.clear()
-            height, width = stdscr.getmaxyx()
-            
-            # Get input (non-blocking)
+        # Bind per-frame lookups to locals once, outside the loop
+        ui = self.ui
+        dirty_event = ui._dirty
+        get_metrics = ui.get_metrics
+        getch = stdscr.getch
+        getmaxyx = stdscr.getmaxyx
+        doupdate = curses.doupdate
+        render_header = self._render_header
+        render_menu = self._render_menu
+        render_alerts = self._render_alerts
+        render_metrics = self._render_metrics
+        render_footer = self._render_footer
+        KEY_UP = curses.KEY_UP
+        KEY_DOWN = curses.KEY_DOWN
+        ORD_Q = ord('q')
+        ORD_NL = ord('\n')
+        
+        while ui.running:
+            # Block until a key arrives or the timeout elapses
             try:
-                key = stdscr.getch()
+                key = getch()
             except:
                 key = -1
             
             # Handle input
-            if key == ord('q'):
-                self.ui.running = False
-            elif key == curses.KEY_UP:
+            if key == ORD_Q:
+                ui.running = False
+            elif key == KEY_UP:
                 menu.move_up()
-            elif key == curses.KEY_DOWN:
+            elif key == KEY_DOWN:
                 menu.move_down()
-            elif key == ord('\n'):
+            elif key == ORD_NL:
                 item = menu.get_current_item()
                 if item and item.action:
                     item.action()
             
-            # Render components
-            self._render_header(stdscr, width)
-            self._render_menu(stdscr, menu, width, height)
-            self._render_alerts(stdscr, width, height)
-            self._render_metrics(stdscr, width, height)
-            self._render_footer(stdscr, width, height)
+            # Start from a blank screen only when the terminal is resized
+            if getmaxyx() != size:
+                size = getmaxyx()
+                stdscr.erase()
+                stdscr.noutrefresh()
+                self._layout(height=size[0], width=size[1], menu_rows=len(menu.items))
+                self._last_regions.clear()
+                self._last_metrics = None
+                last_frame = None
+                windows = self._windows
+            height, width = size
+            
+            # Nothing to redraw without input, new alerts or metric changes
+            dirty = dirty_event.is_set()
+            dirty_event.clear()
+            metrics = get_metrics()
+            frame = tuple(metrics.values())
+            if key == -1 and not dirty and frame == last_frame:
+                continue
+            last_frame = frame
+            
+            # Changed regions stage their window; one update emits them all
+            render_header(windows['header'], width)
+            render_menu(windows['menu'], menu, width, height)
+            render_alerts(windows['alerts'], width, height)
+            render_metrics(windows['metrics'], metrics, width, height)
+            render_footer(windows['footer'], width, height)
             
-            stdscr.refresh()
-            time.sleep(0.1)
+            doupdate()
+    
+    def _layout(self, height: int, width: int, menu_rows: int) -> None:
+        """Create the region windows for the current terminal size"""
+        def region(nrows: int, begin_y: int) -> Any:
+            if nrows <= 0 or begin_y < 0 or begin_y + nrows > height:
+                return None
+            return curses.newwin(nrows, width, begin_y, 0)
+        
+        # Menu from row 4; alerts (a title row plus up to max_alert_lines)
+        # below it and above the metrics line, never overlapping either
+        menu_bottom = min(height - 10, 4 + menu_rows)
+        alerts_top = max(height - 16, menu_bottom)
+        alerts_rows = min(self.max_alert_lines + 1, height - 4 - alerts_top) if height > 15 else 0
+        
+        self._windows = {
+            'header': region(3, 0),
+            'menu': region(menu_bottom - 4, 4),
+            'alerts': region(alerts_rows, alerts_top),
+            'metrics': region(1, height - 4),
+            'footer': region(1, height - 1),
+        }
     
-    def _render_header(self, stdscr: Any, width: int) -> None:
-        """Render header"""
-        header = "═" * width
-        stdscr.addstr(0, 0, header, curses.COLOR_CYAN)
+    def _draw_region(self, win: Any, region: str, cells: Tuple) -> None:
+        """Redraw a region's window with (y, x, text, attr) cells if they changed since the last frame"""
+        if win is None or cells == self._last_regions.get(region):
+            return
         
+        win.erase()
+        for y, x, text, attr in cells:
+            try:
+                win.addstr(y, x, text, attr)
+            except curses.error:
+                # Filling a window's bottom-right cell leaves the cursor out
+                # of bounds; the text itself has been drawn
+                pass
+        win.noutrefresh()
+        self._last_regions[region] = cells
+    
+    def _render_header(self, win: Any, width: int) -> None:
+        """Render header"""
         title = "DEVILNET - ML ANOMALY DETECTION ENGINE"
-        x = (width - len(title)) // 2
-        stdscr.addstr(1, x, title, curses.color_pair(1) | curses.A_BOLD)
-        
         status = "● RUNNING" if self.ui.running else "● STOPPED"
-        stdscr.addstr(1, width - 15, status, curses.color_pair(1))
         
-        stdscr.addstr(2, 0, "═" * width, curses.COLOR_CYAN)
-    
-    def _render_menu(self, stdscr: Any, menu: Menu, width: int, height: int) -> None:
+        self._draw_region(win, 'header', (
+            (0, 0, "═" * width, curses.COLOR_CYAN),
+            (1, (width - len(title)) // 2, title, curses.color_pair(1) | curses.A_BOLD),
+            (1, width - 15, status, curses.color_pair(1)),
+            (2, 0, "═" * width, curses.COLOR_CYAN),
+        ))
+    
+    def _render_menu(self, win: Any, menu: Menu, width: int, height: int) -> None:
         """Render menu items"""
-        y = 4
+        if win is None:
+            return
+        
+        cells = []
+        y = 0
+        max_y = win.getmaxyx()[0]
+        selected = menu.current_selection
+        sel_attr = self._menu_sel_attr
+        norm_attr = self._menu_norm_attr
         
         for i, item in enumerate(menu.items):
-            if y >= height - 10:
+            if y >= max_y:
                 break
             
             if item.is_separator:
-                stdscr.addstr(y, 0, "─" * width, curses.COLOR_WHITE)
+                cells.append((y, 0, "─" * width, curses.COLOR_WHITE))
             else:
-                is_selected = (i == menu.current_selection)
-                
-                if is_selected:
-                    attr = curses.A_REVERSE | curses.A_BOLD
-                    color = curses.color_pair(4)
-                else:
-                    attr = curses.A_NORMAL
-                    color = curses.color_pair(5)
-                
+                attr = sel_attr if i == selected else norm_attr
                 line = f"  {item.label}"
-                stdscr.addstr(y, 0, line[:width], attr | color)
+                cells.append((y, 0, line[:width], attr))
             
             y += 1
+        
+        self._draw_region(win, 'menu', tuple(cells))
     
-    def _render_alerts(self, stdscr: Any, width: int, height: int) -> None:
+    def _render_alerts(self, win: Any, width: int, height: int) -> None:
         """Render recent alerts"""
-        alerts = self.ui.alert_queue.get_recent(self.max_alert_lines)
+        if win is None:
+            return
         
-        alert_y = height - 15
-        if alert_y > 0:
-            stdscr.addstr(alert_y - 1, 0, "─" * width, curses.COLOR_WHITE)
-            stdscr.addstr(alert_y - 1, 2, "ALERTS", curses.color_pair(4) | curses.A_BOLD)
-            
-            for i, alert in enumerate(alerts[-self.max_alert_lines:]):
-                y = alert_y + i
-                if y >= height - 2:
-                    break
-                
-                color = {
-                    AlertLevel.INFO: curses.color_pair(4),
-                    AlertLevel.WARNING: curses.color_pair(2),
-                    AlertLevel.CRITICAL: curses.color_pair(3),
-                    AlertLevel.SUCCESS: curses.color_pair(1),
-                }.get(alert.level, curses.COLOR_WHITE)
-                
-                alert_str = str(alert)[:width-2]
-                stdscr.addstr(y, 2, alert_str, color)
+        # Newest alerts that fit below the title row
+        max_y = win.getmaxyx()[0]
+        alerts = self.ui.alert_queue.peek_recent(min(self.max_alert_lines, max_y - 1))
+        cells = [
+            (0, 0, "─" * width, curses.COLOR_WHITE),
+            (0, 2, "ALERTS", curses.color_pair(4) | curses.A_BOLD),
+        ]
+        
+        colors = self._alert_colors
+        default_color = self._default_alert_color
+        text_width = width - 2
+        
+        for y, alert in enumerate(alerts, start=1):
+            color = colors.get(alert.level, default_color)
+            cells.append((y, 2, alert.rendered[:text_width], color))
+        
+        self._draw_region(win, 'alerts', tuple(cells))
     
-    def _render_metrics(self, stdscr: Any, width: int, height: int) -> None:
+    def _render_metrics(self, win: Any, metrics: Dict[str, Any], width: int, height: int) -> None:
         """Render metrics"""
-        metrics = self.ui.get_metrics()
-        metrics_y = height - 4
+        if win is None:
+            return
         
-        if metrics_y > 0:
+        key = (
+            metrics['alerts_total'],
+            metrics['anomalies_detected'],
+            metrics['actions_taken'],
+            metrics['uptime_seconds'],
+        )
+        if key != self._last_metrics:
+            self._last_metrics = key
             metrics_line = (
                 f"Alerts: {metrics['alerts_total']} | "
                 f"Anomalies: {metrics['anomalies_detected']} | "
                 f"Actions: {metrics['actions_taken']} | "
                 f"Uptime: {metrics['uptime_seconds']}s"
             )[:width-2]
-            stdscr.addstr(metrics_y, 2, metrics_line, curses.color_pair(4))
+            self._draw_region(win, 'metrics', (
+                (0, 2, metrics_line, curses.color_pair(4)),
+            ))
     
-    def _render_footer(self, stdscr: Any, width: int, height: int) -> None:
+    def _render_footer(self, win: Any, width: int, height: int) -> None:
         """Render footer"""
-        footer_y = height - 1
+        # Constant for a given terminal size; redrawn only after a resize
+        if win is None or 'footer' in self._last_regions:
+            return
+        
         footer = "UP/DOWN: Navigate | ENTER: Select | Q: Quit"
         footer_line = footer[:width-2]
-        stdscr.addstr(footer_y, 2, footer_line, curses.color_pair(2))
+        self._draw_region(win, 'footer', (
+            (0, 2, footer_line, curses.color_pair(2)),
+        ))
 
 
 class NonBlockingAlertHandler:
-    """Handles alerts in background thread"""
+    """Turns submitted anomalies into UI alerts on a background thread"""
     
     def __init__(self, ui: InteractiveUI, engine):
         self.ui = ui
         self.engine = engine
-        self.running = True
         self.thread = None
         self.lock = threading.Lock()
+        self._stop_evt = threading.Event()
+        # Anomalies handed over by submit(); the thread sleeps until woken
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the handler has not been asked to stop"""
+        return not self._stop_evt.is_set()
     
     def start(self) -> None:
         """Start alert handler thread"""
@@ -411,33 +542,64 @@ class NonBlockingAlertHandler:
     
     def stop(self) -> None:
         """Stop alert handler thread"""
-        self.running = False
+        self._stop_evt.set()
+        self._wake.set()
         if self.thread:
             self.thread.join(timeout=2)
         logger.info("Alert handler stopped")
     
+    def submit(self, anomaly) -> None:
+        """Queue an anomaly for display without blocking the caller"""
+        self._pending.append(anomaly)
+        self._wake.set()
+    
     def _alert_loop(self) -> None:
-        """Background alert processing loop"""
-        while self.running:
+        """Background alert processing loop; wakes only when work is submitted"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
             try:
-                # Check for new anomalies
-                # This would be called from the main engine loop
-                # and won't block the UI
-                time.sleep(1)
+                self._drain()
             except Exception as e:
-                logger.error(f"Alert handler error: {e}")
+                logger.error("Alert handler error: %s", e)
                 self.ui.add_alert(f"Alert error: {e}", AlertLevel.WARNING)
+            
+            if self._stop_evt.is_set():
+                return
+    
+    def _drain(self) -> None:
+        """Dispatch every pending anomaly to the UI as one batch"""
+        anomalies = []
+        while self._pending:
+            anomalies.append(self._pending.popleft())
+        if not anomalies:
+            return
+        
+        self.ui.add_alerts_batch([
+            (f"Anomaly detected: {anomaly.event_type} ({anomaly.risk_level})", AlertLevel.CRITICAL)
+            for anomaly in anomalies
+        ])
+        self.ui.update_metrics(anomalies_detected=len(anomalies))
 
 
 class MonitoringThread:
     """Runs continuous monitoring in background"""
     
-    def __init__(self, ui: InteractiveUI, engine):
+    def __init__(self, ui: InteractiveUI, engine, alert_handler: NonBlockingAlertHandler):
         self.ui = ui
         self.engine = engine
-        self.running = False
+        # Turns each cycle's anomalies into UI alerts off this thread
+        self.alert_handler = alert_handler
         self.thread = None
         self.lock = threading.Lock()
+        # Set while stopped; waiting on it doubles as an interruptible sleep
+        self._stop_evt = threading.Event()
+        self._stop_evt.set()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the monitoring loop is active"""
+        return not self._stop_evt.is_set()
     
     def start(self) -> None:
         """Start monitoring thread"""
@@ -445,7 +607,7 @@ class MonitoringThread:
             if self.running:
                 return
             
-            self.running = True
+            self._stop_evt.clear()
             self.thread = threading.Thread(target=self._monitoring_loop, daemon=True)
             self.thread.start()
             self.ui.add_alert("Monitoring started", AlertLevel.SUCCESS)
@@ -457,9 +619,10 @@ class MonitoringThread:
             if not self.running:
                 return
             
-            self.running = False
+            self._stop_evt.set()
         
-        if self.thread:
+        # The loop stops itself after repeated errors and can't join itself
+        if self.thread and self.thread is not threading.current_thread():
             self.thread.join(timeout=5)
         
         self.ui.add_alert("Monitoring stopped", AlertLevel.WARNING)
@@ -470,52 +633,52 @@ class MonitoringThread:
         error_count = 0
         max_consecutive_errors = 5
         
-        while self.running:
+        while not self._stop_evt.is_set():
             try:
                 # Run inference cycle
                 anomalies = self.engine.run_inference_cycle()
                 
                 if anomalies:
-                    self.ui.update_metrics(anomalies_detected=len(anomalies))
                     for anomaly in anomalies:
-                        self.ui.add_alert(
-                            f"Anomaly detected: {anomaly.event_type} ({anomaly.risk_level})",
-                            AlertLevel.CRITICAL
-                        )
-                        self.ui.update_metrics(actions_taken=1)
+                        self.alert_handler.submit(anomaly)
+                    self.ui.update_metrics(actions_taken=len(anomalies))
                 
                 error_count = 0  # Reset on success
-                time.sleep(5)  # Poll interval
+                if self._stop_evt.wait(5):  # Poll interval
+                    break
             
             except Exception as e:
                 error_count += 1
-                logger.error(f"Monitoring cycle error: {e}")
-                self.ui.add_alert(f"Monitoring error: {e}", AlertLevel.WARNING)
+                now = datetime.now()
+                logger.error("Monitoring cycle error: %s", e)
+                self.ui.add_alert(f"Monitoring error: {e}", AlertLevel.WARNING, timestamp=now)
                 self.ui.update_metrics(errors=1)
                 
                 if error_count >= max_consecutive_errors:
-                    logger.error(f"Too many errors ({error_count}), pausing monitoring")
+                    logger.error("Too many errors (%d), pausing monitoring", error_count)
                     self.ui.add_alert(
                         "Monitoring paused due to repeated errors",
-                        AlertLevel.CRITICAL
+                        AlertLevel.CRITICAL,
+                        timestamp=now,
                     )
                     self.stop()
                     break
                 
-                time.sleep(2)  # Back-off before retry
+                if self._stop_evt.wait(2):  # Back-off before retry
+                    break
 
 
 def run_interactive_ui(engine) -> None:
     """Run the interactive UI"""
     ui = InteractiveUI()
     
-    # Start monitoring thread
-    monitoring = MonitoringThread(ui, engine)
-    
     # Start alert handler
     alert_handler = NonBlockingAlertHandler(ui, engine)
     alert_handler.start()
     
+    # Monitoring thread delivers anomalies through the alert handler
+    monitoring = MonitoringThread(ui, engine, alert_handler)
+    
     ui.add_alert("Devilnet started - Ready to monitor", AlertLevel.SUCCESS)
     
     # Render UI
@@ -5,15 +5,45 @@ Tests detection pipeline, ML model, incident response, and security constraints.
 """
 
 import unittest
+import copy
+import gc
+import importlib.util
 import json
+import os
+import re
 import tempfile
+import threading
+import weakref
+from dataclasses import fields
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+from devilnet.core.config import get_default_config
+from devilnet.core.mitre_mapping import MitreATTACKMapping
+from devilnet.ingestion import log_parser
+from devilnet.ingestion.log_parser import AuthEvent, LogParser
+from devilnet.ml.feature_extraction import FeatureExtractor
+from devilnet.reporting.reporter import IncidentReportGenerator
+from devilnet.response.incident_response import (
+    AlertCoalescer, CooldownManager, IncidentResponseAction, ResponseAction,
+    ResponseDecisionEngine, SafeResponseExecutor,
+)
+from devilnet.ui.terminal_ui import (
+    Alert, AlertLevel, AlertQueue, InteractiveUI, MonitoringThread,
+    NonBlockingAlertHandler,
+)
 
 # Test data generators
 def create_normal_auth_event(timestamp=None):
     """Create a normal authentication event"""
-    from devilnet.ingestion.log_parser import AuthEvent
     return AuthEvent(
         timestamp=(timestamp or datetime.now()).isoformat(),
         host='webserver',
@@ -30,7 +60,6 @@ def create_normal_auth_event(timestamp=None):
 
 def create_brute_force_event(ip='203.0.113.99', timestamp=None):
     """Create a brute force attack event"""
-    from devilnet.ingestion.log_parser import AuthEvent
     return AuthEvent(
         timestamp=(timestamp or datetime.now()).isoformat(),
         host='webserver',
@@ -45,13 +74,65 @@ def create_brute_force_event(ip='203.0.113.99', timestamp=None):
     )
 
 
+# auth.log sample hitting every batch-parsed pattern plus unrecognised lines
+_AUTH_LOG_LINES = [
+    'Jan 15 14:32:10 server sshd[1234]: Failed password for root from 203.0.113.99 port 54321 ssh2',
+    '',
+    'Jan 15 14:32:11 server sshd[1234]: Accepted publickey for alice from 192.168.1.100 port 22000 ssh2',
+    'Jan 15 14:32:12 server sshd[1234]: Invalid user oracle from 203.0.113.99 port 54322',
+    'Jan 15 14:32:13 server sshd[1234]: Disconnected from 203.0.113.99 port 54322',
+    'Jan 15 14:32:14 server sudo: alice : TTY=pts/0 ; PWD=/home/alice ; USER=root ; COMMAND=/bin/ls',
+    'Jan 15 14:32:15 server sudo: mallory : command not allowed',
+    'Jan 15 14:32:16 server cron[42]: (root) CMD (run-parts /etc/cron.hourly)',
+]
+
+
+def _comparable_event(event):
+    """AuthEvent as a dict, minus the parse-time stamp on unrecognised lines"""
+    if event is None:
+        return None
+    fields = event.to_dict()
+    if event.event_type == 'unknown':
+        fields.pop('timestamp')
+    return fields
+
+
+def _fake_hyperscan(compile_error=None):
+    """Stand-in hyperscan module whose Database reports matches found with re"""
+    
+    class FakeHyperscanError(Exception):
+        pass
+    
+    class FakeDatabase:
+        def compile(self, expressions, ids, elements, flags):
+            if compile_error is not None:
+                raise FakeHyperscanError(compile_error)
+            self.patterns = [re.compile(expression.decode()) for expression in expressions]
+        
+        def scan(self, data, match_event_handler):
+            offset = 0
+            for raw in data.split(b'\n'):
+                line = raw.decode()
+                for pattern_id, pattern in enumerate(self.patterns):
+                    match = pattern.search(line)
+                    if match:
+                        end = offset + len(line[:match.end()].encode())
+                        match_event_handler(pattern_id, 0, end, 0, None)
+                offset += len(raw) + 1
+    
+    return SimpleNamespace(
+        Database=FakeDatabase,
+        HS_FLAG_UTF8=1,
+        HS_FLAG_UCP=2,
+        error=FakeHyperscanError,
+    )
+
+
 class TestLogParsing(unittest.TestCase):
     """Test log parsing and event extraction"""
     
     def test_parse_ssh_failed_login(self):
         """Test SSH failed login parsing"""
-        from devilnet.ingestion.log_parser import LogParser
-        
         line = 'Jan 15 14:32:10 server sshd[1234]: Failed password for root from 203.0.113.99 port 54321 ssh2'
         event = LogParser.parse_auth_log_line(line)
         
@@ -62,8 +143,6 @@ class TestLogParsing(unittest.TestCase):
     
     def test_parse_ssh_successful_login(self):
         """Test SSH successful login parsing"""
-        from devilnet.ingestion.log_parser import LogParser
-        
         line = 'Jan 15 14:32:10 server sshd[1234]: Accepted publickey for alice from 192.168.1.100 port 22000 ssh2'
         event = LogParser.parse_auth_log_line(line)
         
@@ -73,13 +152,62 @@ class TestLogParsing(unittest.TestCase):
     
     def test_parse_sudo_success(self):
         """Test sudo command parsing"""
-        from devilnet.ingestion.log_parser import LogParser
-        
         line = 'Jan 15 14:32:10 server sudo: alice : TTY=pts/0 ; PWD=/home/alice ; USER=root ; COMMAND=/bin/systemctl restart nginx'
         event = LogParser.parse_auth_log_line(line)
         
         self.assertIsNotNone(event)
         self.assertIn('sudo', event.event_type)
+    
+    def test_parse_auth_log_batch_matches_lines(self):
+        """Test batch parsing yields the same events as per-line parsing"""
+        lines = _AUTH_LOG_LINES
+        expected = [_comparable_event(LogParser.parse_auth_log_line(line)) for line in lines]
+        batched = [_comparable_event(event) for event in LogParser.parse_auth_log_batch(lines)]
+        
+        self.assertEqual(batched, expected)
+        self.assertEqual(
+            [e and e['event_type'] for e in batched],
+            [
+                'login_failed', None, 'login_success', 'invalid_user_attempt',
+                'unknown', 'sudo_success', 'sudo_failure', 'unknown',
+            ],
+        )
+    
+    def test_parse_auth_log_batch_uses_prefilter_candidates(self):
+        """Test batch parsing only tries the patterns the prefilter matched"""
+        lines = _AUTH_LOG_LINES
+        expected = [_comparable_event(LogParser.parse_auth_log_line(line)) for line in lines]
+        
+        with mock.patch.object(log_parser, 'hyperscan', _fake_hyperscan()), \
+                mock.patch.object(LogParser, '_auth_hs_db', None), \
+                mock.patch.object(LogParser, '_auth_hs_failed', False):
+            batched = [_comparable_event(event) for event in LogParser.parse_auth_log_batch(lines)]
+            self.assertEqual(batched, expected)
+            
+            # A database that reports no matches leaves every line unrecognised
+            LogParser._auth_hs_db = SimpleNamespace(scan=lambda data, match_event_handler: None)
+            events = LogParser.parse_auth_log_batch(lines)
+            self.assertEqual(
+                [e and e.event_type for e in events],
+                ['unknown', None] + ['unknown'] * (len(lines) - 2),
+            )
+    
+    def test_parse_auth_log_batch_falls_back_when_prefilter_fails(self):
+        """Test a hyperscan compile error falls back to per-line re matching"""
+        lines = _AUTH_LOG_LINES
+        expected = [_comparable_event(LogParser.parse_auth_log_line(line)) for line in lines]
+        fake = _fake_hyperscan(compile_error='lookaround not supported')
+        
+        with mock.patch.object(log_parser, 'hyperscan', fake), \
+                mock.patch.object(LogParser, '_auth_hs_db', None), \
+                mock.patch.object(LogParser, '_auth_hs_failed', False):
+            with self.assertLogs(log_parser.logger, level='WARNING') as logs:
+                batched = [_comparable_event(event) for event in LogParser.parse_auth_log_batch(lines)]
+                LogParser.parse_auth_log_batch(lines)
+            
+            self.assertEqual(batched, expected)
+            self.assertTrue(LogParser._auth_hs_failed)
+            self.assertEqual(len(logs.records), 1)  # Warned once, not per batch
 
 
 class TestFeatureExtraction(unittest.TestCase):
@@ -87,8 +215,6 @@ class TestFeatureExtraction(unittest.TestCase):
     
     def test_extract_features(self):
         """Test basic feature extraction"""
-        from devilnet.ml.feature_extraction import FeatureExtractor
-        
         extractor = FeatureExtractor()
         event = create_normal_auth_event()
         vector = extractor.extract_features(event)
@@ -99,23 +225,100 @@ class TestFeatureExtraction(unittest.TestCase):
     
     def test_per_ip_features(self):
         """Test per-IP feature aggregation"""
-        from devilnet.ml.feature_extraction import FeatureExtractor
-        
         extractor = FeatureExtractor()
         ip = '203.0.113.99'
         
         # Simulate 10 failed attempts from same IP
+        base = datetime.now()
         for i in range(10):
-            event = create_brute_force_event(ip=ip, timestamp=datetime.now() - timedelta(seconds=i*10))
+            event = create_brute_force_event(ip=ip, timestamp=base - timedelta(seconds=i*10))
             vector = extractor.extract_features(event)
         
         # Last vector should show aggregated features
         self.assertGreater(vector.ip_failed_logins, 0)
     
+    def test_extract_features_batch_matches_sequential(self):
+        """Test batch extraction yields the same vectors as per-event calls"""
+        base = datetime.now()
+        events = [create_normal_auth_event(timestamp=base - timedelta(days=1))]
+        events += [
+            create_brute_force_event(timestamp=base - timedelta(seconds=i*10))
+            for i in range(10)
+        ]
+        
+        sequential = FeatureExtractor()
+        expected = [sequential.extract_features(event) for event in events]
+        
+        batched = FeatureExtractor()
+        self.assertEqual(batched.extract_features_batch(events), expected)
+    
+    def test_extract_features_batch_ip_counts_with_history(self):
+        """Test batched per-IP counts across IPs, users and prior history"""
+        base = datetime.now()
+        history = [create_brute_force_event(timestamp=base - timedelta(seconds=60))]
+        events = [create_normal_auth_event(timestamp=base - timedelta(days=1))]
+        for i in range(12):
+            event = create_brute_force_event(
+                ip=['203.0.113.99', '198.51.100.7'][i % 2],
+                timestamp=base - timedelta(seconds=50 - i),
+            )
+            event.username = ['admin', 'root', 'guest'][i % 3]
+            events.append(event)
+        
+        sequential = FeatureExtractor()
+        sequential.extract_features_batch(history)
+        expected = [sequential.extract_features(event) for event in events]
+        
+        batched = FeatureExtractor()
+        batched.extract_features_batch(history)
+        vectors = batched.extract_features_batch(events)
+        self.assertEqual(vectors, expected)
+        self.assertEqual(vectors[-1].ip_unique_users_attempted, 3)
+    
+    def test_extract_from_columns_matches_batch(self):
+        """Test columnar extraction yields the same vectors as row events"""
+        base = datetime.now()
+        events = [
+            create_brute_force_event(timestamp=base - timedelta(seconds=i*10))
+            for i in range(10)
+        ]
+        columns = {
+            f.name: [getattr(event, f.name) for event in events]
+            for f in fields(events[0])
+        }
+        
+        expected = FeatureExtractor().extract_features_batch(events)
+        self.assertEqual(FeatureExtractor().extract_from_columns(columns), expected)
+    
+    def test_state_snapshot_round_trip(self):
+        """Test an extractor restored from a snapshot continues identically"""
+        base = datetime.now()
+        warmup = [create_normal_auth_event(timestamp=base - timedelta(seconds=90))]
+        warmup += [
+            create_brute_force_event(timestamp=base - timedelta(seconds=i*10))
+            for i in range(5)
+        ]
+        events = [
+            create_brute_force_event(ip='198.51.100.7', timestamp=base),
+            create_normal_auth_event(timestamp=base),
+        ]
+        
+        warm = FeatureExtractor()
+        warm.extract_features_batch(warmup)
+        state = warm.dump_state()
+        original = copy.deepcopy(state)
+        
+        restored = FeatureExtractor.from_state(state)
+        self.assertEqual(
+            restored.extract_features_batch(events),
+            warm.extract_features_batch(events),
+        )
+        
+        # Neither extractor's later updates leak into the snapshot
+        self.assertEqual(state, original)
+    
     def test_user_new_ip_detection(self):
         """Test detection of login from new IP"""
-        from devilnet.ml.feature_extraction import FeatureExtractor
-        
         extractor = FeatureExtractor()
         
         # First login from IP1
@@ -134,49 +337,74 @@ class TestFeatureExtraction(unittest.TestCase):
         self.assertTrue(vector2.user_new_ip_detected)
 
 
+class _TrainedPipeline:
+    """Baseline extractor and model trained once per process, on first use"""
+    
+    @cached_property
+    def baseline(self):
+        """Feature extractor and vectors for 100 normal logins"""
+        extractor = FeatureExtractor()
+        base = datetime.now()
+        timestamps = [base - timedelta(hours=i) for i in range(100)]
+        vectors = [
+            extractor.extract_features(create_normal_auth_event(timestamp=t))
+            for t in timestamps
+        ]
+        return extractor, vectors
+    
+    @cached_property
+    def pipeline(self):
+        """Pipeline trained on the baseline, saved under a temporary directory"""
+        from devilnet.ml.pipeline import MLPipeline
+        
+        # Removed by TemporaryDirectory's finalizer at interpreter exit
+        self._model_dir = tempfile.TemporaryDirectory()
+        pipeline = MLPipeline(model_path=str(Path(self._model_dir.name) / 'model.pkl'))
+        pipeline.train_from_baseline(self.baseline[1])
+        return pipeline
+
+
+_SHARED = _TrainedPipeline()
+
+
 class TestMLPipeline(unittest.TestCase):
     """Test machine learning pipeline"""
     
+    # Model training dominates suite runtime; lets CI shard with -m "not slow"
+    if pytest is not None:
+        pytestmark = pytest.mark.slow
+    
+    @classmethod
+    def setUpClass(cls):
+        """Skip without the ML stack; otherwise share the process-wide model"""
+        # numpy/scikit-learn are only needed here; keep them out of module import
+        try:
+            from devilnet.ml.pipeline import IsolationForest
+        except ImportError as e:
+            raise unittest.SkipTest(f"ML dependencies unavailable: {e}")
+        if IsolationForest is None:
+            raise unittest.SkipTest("scikit-learn not installed")
+        
+        cls.pipeline = _SHARED.pipeline
+        cls.extractor, cls.baseline_vectors = _SHARED.baseline
+    
     def test_model_training(self):
         """Test model training on normal data"""
-        from devilnet.ml.pipeline import MLPipeline
-        from devilnet.ml.feature_extraction import FeatureExtractor
-        
-        # Generate baseline vectors
-        extractor = FeatureExtractor()
-        vectors = []
-        for i in range(100):
-            event = create_normal_auth_event(timestamp=datetime.now() - timedelta(hours=i))
-            vector = extractor.extract_features(event)
-            vectors.append(vector)
-        
-        # Train model
-        pipeline = MLPipeline()
-        pipeline.train_from_baseline(vectors)
-        
-        self.assertTrue(pipeline.is_trained)
+        self.assertTrue(self.pipeline.is_trained)
+        self.assertTrue(Path(self.pipeline.model_path).exists())
     
     def test_anomaly_detection(self):
         """Test anomaly detection on attack data"""
-        from devilnet.ml.pipeline import MLPipeline
-        from devilnet.ml.feature_extraction import FeatureExtractor
-        
-        # Train on normal data
-        extractor = FeatureExtractor()
-        baseline_vectors = []
-        for i in range(100):
-            event = create_normal_auth_event(timestamp=datetime.now() - timedelta(hours=i))
-            vector = extractor.extract_features(event)
-            baseline_vectors.append(vector)
-        
-        pipeline = MLPipeline()
-        pipeline.train_from_baseline(baseline_vectors)
+        # Continue from the baseline window without touching the shared extractor
+        extractor = copy.deepcopy(self.extractor)
+        pipeline = self.pipeline
         
         # Test with attack data
         attack_vectors = []
         metadata = []
+        now = datetime.now()
         for i in range(10):
-            event = create_brute_force_event()
+            event = create_brute_force_event(timestamp=now)
             vector = extractor.extract_features(event)
             attack_vectors.append(vector)
             metadata.append({
@@ -193,6 +421,28 @@ class TestMLPipeline(unittest.TestCase):
         # Some should be anomalous
         is_anomalous = [a.is_anomaly for a in anomalies]
         self.assertTrue(any(is_anomalous))
+        
+        # Masked inference returns exactly the flagged rows
+        flagged = pipeline.infer(attack_vectors, metadata, anomalies_only=True)
+        self.assertEqual(flagged, [a for a in anomalies if a.is_anomaly])
+    
+    def test_n_jobs_reaches_isolation_forest(self):
+        """Test MLPipeline passes n_jobs through to the forest"""
+        from devilnet.ml.pipeline import MLPipeline
+        
+        pipeline = MLPipeline(model_path=os.devnull, n_jobs=2)
+        self.assertEqual(pipeline.model.model.n_jobs, 2)
+        self.assertIsNone(MLPipeline(model_path=os.devnull).model.model.n_jobs)
+    
+    def test_normalization_stays_float32(self):
+        """Test a float32 feature matrix is normalized without upcasting"""
+        from devilnet.ml.pipeline import build_feature_matrix
+        
+        normalized = self.pipeline.model._normalize_features(
+            build_feature_matrix(self.baseline_vectors[:20])
+        )
+        self.assertEqual(normalized.dtype.name, 'float32')
+        self.assertTrue(normalized.flags['C_CONTIGUOUS'])
 
 
 class TestMitreMapping(unittest.TestCase):
@@ -200,8 +450,6 @@ class TestMitreMapping(unittest.TestCase):
     
     def test_brute_force_mapping(self):
         """Test brute force technique mapping"""
-        from devilnet.core.mitre_mapping import MitreATTACKMapping
-        
         techniques = MitreATTACKMapping.get_techniques_for_event(
             'login_failed',
             {'ip_failed_logins': 10, 'ip_unique_users_attempted': 5}
@@ -212,8 +460,6 @@ class TestMitreMapping(unittest.TestCase):
     
     def test_privilege_escalation_mapping(self):
         """Test privilege escalation technique mapping"""
-        from devilnet.core.mitre_mapping import MitreATTACKMapping
-        
         techniques = MitreATTACKMapping.get_techniques_for_event(
             'sudo_success',
             {}
@@ -224,8 +470,6 @@ class TestMitreMapping(unittest.TestCase):
     
     def test_get_specific_technique(self):
         """Test retrieving specific technique"""
-        from devilnet.core.mitre_mapping import MitreATTACKMapping
-        
         technique = MitreATTACKMapping.get_technique('T1110')
         
         self.assertIsNotNone(technique)
@@ -237,8 +481,6 @@ class TestIncidentResponse(unittest.TestCase):
     
     def test_response_decision_engine(self):
         """Test response action determination"""
-        from devilnet.response.incident_response import ResponseDecisionEngine
-        
         engine = ResponseDecisionEngine()
         
         actions = engine.determine_response(
@@ -254,8 +496,6 @@ class TestIncidentResponse(unittest.TestCase):
     
     def test_cooldown_manager(self):
         """Test cooldown policy enforcement"""
-        from devilnet.response.incident_response import CooldownManager, ResponseAction
-        
         manager = CooldownManager()
         
         # First action should be allowed
@@ -276,6 +516,129 @@ class TestIncidentResponse(unittest.TestCase):
             cooldown_seconds=10
         )
         self.assertFalse(should_allow)
+    
+    def test_cooldown_try_acquire(self):
+        """Test atomic cooldown check-and-record"""
+        manager = CooldownManager()
+        
+        self.assertTrue(manager.try_acquire(ResponseAction.BLOCK_IP, '203.0.113.99', cooldown_seconds=10))
+        self.assertFalse(manager.try_acquire(ResponseAction.BLOCK_IP, '203.0.113.99', cooldown_seconds=10))
+        
+        # Other targets are unaffected
+        self.assertTrue(manager.try_acquire(ResponseAction.BLOCK_IP, '198.51.100.45', cooldown_seconds=10))
+    
+    def test_alert_coalescing(self):
+        """Test duplicate alerts are suppressed and summarized"""
+        coalescer = AlertCoalescer(window_seconds=60)
+        key = ('login_failed', '203.0.113.99', 'admin')
+        
+        self.assertTrue(coalescer.offer(key, 'first'))
+        self.assertFalse(coalescer.offer(key, 'second'))
+        self.assertFalse(coalescer.offer(key, 'third'))
+        
+        # Window still open - nothing to report yet
+        self.assertEqual(coalescer.expire(), [])
+        self.assertEqual(coalescer.expire(force=True), [(2, 'third')])
+    
+    def test_response_log_written_after_flush(self):
+        """Test buffered audit log entries reach disk once flushed"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = SafeResponseExecutor(response_log_dir=tmpdir, enable_actions=True)
+            action = IncidentResponseAction(
+                action_type=ResponseAction.BLOCK_IP,
+                target='203.0.113.99',
+                reason='Test',
+                severity='HIGH',
+                timestamp=datetime.now().isoformat(),
+                event_id='test-event',
+            )
+            
+            log_entry = executor.execute_response(action)
+            self.assertTrue(log_entry.success)
+            executor.flush()
+            
+            lines = [
+                line
+                for log_file in Path(tmpdir).glob('responses_*.jsonl')
+                for line in log_file.read_text().splitlines()
+            ]
+            self.assertEqual(len(lines), 1)
+            self.assertEqual(json.loads(lines[0])['action']['target'], '203.0.113.99')
+    
+    def test_register_handler(self):
+        """Test handlers are replaced through register_handler() only"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = SafeResponseExecutor(response_log_dir=tmpdir, enable_actions=True)
+            executor.register_handler(ResponseAction.BLOCK_IP, lambda action: ("blocked", None))
+            log_entry = executor.execute_response(IncidentResponseAction(
+                action_type=ResponseAction.BLOCK_IP,
+                target='203.0.113.99',
+                reason='Test',
+                severity='HIGH',
+                timestamp=datetime.now().isoformat(),
+                event_id='test-event',
+            ))
+            self.assertEqual(log_entry.result_message, "blocked")
+            
+            # Alerts never reach a handler, so registering one is an error
+            with self.assertRaises(ValueError):
+                executor.register_handler(ResponseAction.ALERT_ONLY, lambda action: ("", None))
+            with self.assertRaises(TypeError):
+                executor.handlers[ResponseAction.BLOCK_IP] = None
+            executor.close()
+    
+    def test_response_log_written_after_close(self):
+        """Test entries logged after close() are written instead of queued"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = SafeResponseExecutor(
+                response_log_dir=tmpdir, enable_actions=True, flush_interval_ms=0,
+            )
+            executor.close()
+            action = IncidentResponseAction(
+                action_type=ResponseAction.BLOCK_IP,
+                target='203.0.113.99',
+                reason='Test',
+                severity='HIGH',
+                timestamp=datetime.now().isoformat(),
+                event_id='test-event',
+            )
+            
+            executor.execute_response(action)
+            executor.flush()  # Must not block once closed
+            
+            lines = [
+                line
+                for log_file in Path(tmpdir).glob('responses_*.jsonl')
+                for line in log_file.read_text().splitlines()
+            ]
+            self.assertEqual(len(lines), 1)
+    
+    def test_closed_executor_is_released(self):
+        """Test close() drops the process-lifetime references to the executor"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            executor = SafeResponseExecutor(response_log_dir=tmpdir)
+            executor.close()
+            executor_ref = weakref.ref(executor)
+            del executor
+            gc.collect()
+            self.assertIsNone(executor_ref())
+
+
+# Stand-ins for AnomalyScore in report tests
+_MOCK_ANOMALY_HIGH = SimpleNamespace(
+    anomaly_score=0.85,
+    risk_level="HIGH",
+    confidence=0.92,
+    explanation="Test anomaly",
+    contributing_features={'ip_failed_logins': 0.95},
+)
+_MOCK_ANOMALY_HIGH_BARE = SimpleNamespace(
+    anomaly_score=0.85,
+    risk_level="HIGH",
+    confidence=0.92,
+    explanation="Test",
+    contributing_features={},
+)
 
 
 class TestReporting(unittest.TestCase):
@@ -283,19 +646,10 @@ class TestReporting(unittest.TestCase):
     
     def test_incident_report_generation(self):
         """Test incident report creation"""
-        from devilnet.reporting.reporter import IncidentReportGenerator
-        
         generator = IncidentReportGenerator()
         
-        class MockAnomaly:
-            anomaly_score = 0.85
-            risk_level = "HIGH"
-            confidence = 0.92
-            explanation = "Test anomaly"
-            contributing_features = {'ip_failed_logins': 0.95}
-        
         report = generator.generate_report(
-            anomaly_score=MockAnomaly(),
+            anomaly_score=_MOCK_ANOMALY_HIGH,
             event_type='login_failed',
             source_ip='203.0.113.99',
             username='admin',
@@ -308,19 +662,10 @@ class TestReporting(unittest.TestCase):
     
     def test_report_json_output(self):
         """Test JSON report output"""
-        from devilnet.reporting.reporter import IncidentReportGenerator
-        
         generator = IncidentReportGenerator()
         
-        class MockAnomaly:
-            anomaly_score = 0.85
-            risk_level = "HIGH"
-            confidence = 0.92
-            explanation = "Test"
-            contributing_features = {}
-        
         report = generator.generate_report(
-            anomaly_score=MockAnomaly(),
+            anomaly_score=_MOCK_ANOMALY_HIGH_BARE,
             event_type='login_failed',
             source_ip='203.0.113.99',
             username='admin',
@@ -333,14 +678,125 @@ class TestReporting(unittest.TestCase):
         self.assertIn('incident_id', data)
         self.assertEqual(data['severity'], 'HIGH')
 
+    def test_save_report_written_after_flush(self):
+        """Test queued reports reach disk once flushed"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            generator = IncidentReportGenerator(report_dir=tmpdir)
+            
+            report = generator.generate_report(
+                anomaly_score=_MOCK_ANOMALY_HIGH_BARE,
+                event_type='login_failed',
+                source_ip='203.0.113.99',
+                username='admin',
+                feature_vector=None,
+            )
+            
+            files = generator.save_report(report, format="both")
+            generator.flush()
+            
+            data = json.loads(Path(files['json']).read_text())
+            self.assertEqual(data['incident_id'], report.incident_id)
+            self.assertIn('SECURITY INCIDENT REPORT', Path(files['text']).read_text())
+
+
+class TestTerminalUI(unittest.TestCase):
+    """Test terminal UI state handling"""
+    
+    def test_alert_queue_bounded_recent(self):
+        """Test alert queue evicts oldest and peeks newest without removing"""
+        alert_queue = AlertQueue(max_size=5)
+        now = datetime.now()
+        for i in range(8):
+            alert_queue.put(Alert(message=f"Alert {i}", level=AlertLevel.INFO, timestamp=now))
+        
+        recent = alert_queue.get_recent(3)
+        self.assertEqual([a.message for a in recent], ["Alert 5", "Alert 6", "Alert 7"])
+        
+        # Reading recent alerts must not consume them
+        alerts = alert_queue.get_all()
+        self.assertEqual(len(alerts), 5)
+        self.assertEqual(alerts[0].message, "Alert 3")
+        self.assertEqual(alert_queue.get_all(), [])
+    
+    def test_alert_queue_concurrent_put_and_peek(self):
+        """Test peeking while producers write never drops or reorders alerts"""
+        alert_queue = AlertQueue(max_size=1000)
+        now = datetime.now()
+        
+        def produce(thread_id):
+            for i in range(200):
+                alert_queue.put(Alert(message=f"{thread_id}:{i}", level=AlertLevel.INFO, timestamp=now))
+        
+        threads = [threading.Thread(target=produce, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            self.assertLessEqual(len(alert_queue.peek_recent(10)), 10)
+        for thread in threads:
+            thread.join()
+        
+        alerts = alert_queue.get_all()
+        self.assertEqual(len(alerts), 800)
+        for thread_id in range(4):
+            own = [a.message for a in alerts if a.message.startswith(f"{thread_id}:")]
+            self.assertEqual(own, [f"{thread_id}:{i}" for i in range(200)])
+    
+    def test_add_alerts_batch(self):
+        """Test batched alerts are queued in order and counted"""
+        ui = InteractiveUI()
+        ui.add_alerts_batch([
+            ("Anomaly 1", AlertLevel.CRITICAL),
+            ("Anomaly 2", AlertLevel.WARNING),
+        ])
+        
+        recent = ui.alert_queue.get_recent(2)
+        self.assertEqual([a.message for a in recent], ["Anomaly 1", "Anomaly 2"])
+        self.assertEqual(recent[0].timestamp, recent[1].timestamp)
+        self.assertEqual(ui.get_metrics()['alerts_total'], 2)
+    
+    def test_alert_handler_consumes_submitted_anomalies(self):
+        """Test alert handler drains submitted anomalies into the UI"""
+        ui = InteractiveUI()
+        handler = NonBlockingAlertHandler(ui, engine=None)
+        handler.start()
+        handler.submit(SimpleNamespace(event_type='brute_force', risk_level='HIGH'))
+        handler.stop()
+        
+        self.assertFalse(handler.thread.is_alive())
+        recent = ui.alert_queue.get_recent(1)
+        self.assertEqual(recent[0].message, "Anomaly detected: brute_force (HIGH)")
+        self.assertEqual(ui.get_metrics()['anomalies_detected'], 1)
+    
+    def test_monitoring_delivers_anomalies_through_alert_handler(self):
+        """Test monitoring cycles hand anomalies to the alert handler"""
+        ui = InteractiveUI()
+        cycle_ran = threading.Event()
+        
+        def run_inference_cycle():
+            cycle_ran.set()
+            return [SimpleNamespace(event_type='brute_force', risk_level='HIGH')]
+        
+        engine = SimpleNamespace(run_inference_cycle=run_inference_cycle)
+        handler = NonBlockingAlertHandler(ui, engine)
+        handler.start()
+        monitoring = MonitoringThread(ui, engine, handler)
+        monitoring.start()
+        self.assertTrue(cycle_ran.wait(2))
+        monitoring.stop()
+        handler.stop()
+        
+        messages = [a.message for a in ui.alert_queue.get_recent(10)]
+        self.assertIn("Anomaly detected: brute_force (HIGH)", messages)
+        metrics = ui.get_metrics()
+        self.assertEqual(metrics['anomalies_detected'], 1)
+        self.assertEqual(metrics['actions_taken'], 1)
+
 
 class TestSecurityConstraints(unittest.TestCase):
     """Test security framework constraints"""
     
     def test_non_root_requirement(self):
         """Test that engine requires non-root"""
-        import os
-        
         # This should run as non-root
         current_uid = os.getuid()
         
@@ -351,8 +807,6 @@ class TestSecurityConstraints(unittest.TestCase):
     
     def test_config_loading(self):
         """Test security configuration"""
-        from devilnet.core.config import get_default_config
-        
         config = get_default_config()
         
         # Verify security policies are set
@@ -364,6 +818,14 @@ class TestSecurityConstraints(unittest.TestCase):
 
 def run_tests():
     """Run all tests"""
+    # Spread test classes across cores when pytest-xdist is available
+    if pytest is not None and importlib.util.find_spec('xdist') is not None:
+        return pytest.main([
+            '-n', 'auto',
+            '--dist=loadscope',
+            __file__,
+        ]) == 0
+    
     # Create test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -375,6 +837,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestMitreMapping))
     suite.addTests(loader.loadTestsFromTestCase(TestIncidentResponse))
     suite.addTests(loader.loadTestsFromTestCase(TestReporting))
+    suite.addTests(loader.loadTestsFromTestCase(TestTerminalUI))
     suite.addTests(loader.loadTestsFromTestCase(TestSecurityConstraints))
     
     # Run tests